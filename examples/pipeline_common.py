@@ -0,0 +1,104 @@
+"""
+Pipeline helpers shared by the protein-sol example scripts.
+
+The use case scripts are run directly (python examples/use_case_N_*.py), so
+this module is imported from the examples directory.
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+
+# Location of the original protein-sol Perl pipeline
+REPO_DIR = Path(__file__).resolve().parent.parent / "repo" / "protein-sol"
+
+# Make the shared scripts/lib package importable (e.g. lib.io.read_prediction_rows)
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SCRIPTS_DIR))
+
+# Support files the Perl pipeline expects in its working directory
+REQUIRED_FILES = (
+    "multiple_prediction_wrapper_export.sh",
+    "fasta_seq_reformat_export.pl",
+    "seq_compositions_perc_pipeline_export.pl",
+    "server_prediction_seq_export.pl",
+    "seq_props_ALL_export.pl",
+    "profiles_gather_export.pl",
+    "ss_propensities.txt",
+    "seq_reference_data.txt"
+)
+
+# Support files the composition and properties scripts expect
+COMPOSITION_FILES = (
+    "seq_compositions_perc_pipeline_export.pl",
+    "seq_props_ALL_export.pl",
+    "ss_propensities.txt"
+)
+
+# Explicit dtypes let the C parser skip per-column type inference
+RESULT_DTYPES = {
+    'ID': 'string',
+    'sequence': 'string',
+    'percent-sol': 'float32',
+    'scaled-sol': 'float32',
+    'population-sol': 'float32',
+    'pI': 'float32'
+}
+
+
+def prepare_shared_workspace(repo_dir, staging_dir=None, prefix="protein_sol_"):
+    """
+    Stage the pipeline support files once and make the wrapper executable.
+
+    Args:
+        repo_dir (str): Protein-sol repository directory
+        staging_dir (str): Optional directory to stage into. If None, a temp
+            directory is created
+        prefix (str): Name prefix of the temp directory
+
+    Returns:
+        Path: Directory holding the staged support files
+    """
+    repo_dir = Path(repo_dir)
+    if not repo_dir.exists():
+        raise FileNotFoundError(f"Protein-sol repository not found at {repo_dir}")
+
+    if staging_dir is None:
+        staging_dir = tempfile.mkdtemp(prefix=prefix)
+    staging_dir = Path(staging_dir)
+    staging_dir.mkdir(parents=True, exist_ok=True)
+
+    for file in REQUIRED_FILES:
+        src = repo_dir / file
+        if src.exists():
+            shutil.copy2(src, staging_dir / file)
+        else:
+            print(f"Warning: Required file {file} not found")
+
+    (staging_dir / "multiple_prediction_wrapper_export.sh").chmod(0o755)
+    return staging_dir
+
+
+def stage_readonly(src, dst):
+    """
+    Expose a read-only input at dst without copying its bytes when possible.
+
+    Tries a hardlink first, then a symlink, and only falls back to a full
+    copy when both fail (e.g. cross-device or missing permissions).
+
+    Args:
+        src (str): Source file path
+        dst (str): Destination path
+    """
+    src = os.path.abspath(src)
+    try:
+        os.link(src, dst)
+    except OSError:
+        try:
+            os.symlink(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
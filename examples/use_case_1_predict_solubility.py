@@ -15,15 +15,15 @@ Usage:
     python use_case_1_predict_solubility.py --input myprotein.fasta --output myresults
 """
 
-import os
 import sys
 import argparse
 import subprocess
-import tempfile
 import shutil
 import pandas as pd
 from pathlib import Path
 
+from pipeline_common import REPO_DIR, RESULT_DTYPES, prepare_shared_workspace, stage_readonly
+
 
 def run_protein_sol_prediction(input_fasta, output_prefix=None, working_dir=None):
     """
@@ -41,49 +41,14 @@ def run_protein_sol_prediction(input_fasta, output_prefix=None, working_dir=None
     if output_prefix is None:
         output_prefix = Path(input_fasta).stem
 
-    # Get the script directory
-    script_dir = Path(__file__).parent.parent
-    repo_dir = script_dir / "repo" / "protein-sol"
-
-    if not repo_dir.exists():
-        raise FileNotFoundError(f"Protein-sol repository not found at {repo_dir}")
-
-    # Create working directory if needed
-    if working_dir is None:
-        working_dir = tempfile.mkdtemp(prefix="protein_sol_")
-        temp_dir = True
-    else:
-        Path(working_dir).mkdir(parents=True, exist_ok=True)
-        temp_dir = False
+    # Stage support files into the working directory (temp directory if None)
+    temp_dir = working_dir is None
+    working_dir = str(prepare_shared_workspace(REPO_DIR, working_dir))
 
     try:
-        # Copy required files to working directory
-        required_files = [
-            "multiple_prediction_wrapper_export.sh",
-            "fasta_seq_reformat_export.pl",
-            "seq_compositions_perc_pipeline_export.pl",
-            "server_prediction_seq_export.pl",
-            "seq_props_ALL_export.pl",
-            "profiles_gather_export.pl",
-            "ss_propensities.txt",
-            "seq_reference_data.txt"
-        ]
-
-        for file in required_files:
-            src = repo_dir / file
-            dst = Path(working_dir) / file
-            if src.exists():
-                shutil.copy2(src, dst)
-            else:
-                print(f"Warning: Required file {file} not found")
-
-        # Copy input file to working directory
+        # Link input file into working directory
         input_file = Path(working_dir) / "input.fasta"
-        shutil.copy2(input_fasta, input_file)
-
-        # Make wrapper script executable
-        wrapper_script = Path(working_dir) / "multiple_prediction_wrapper_export.sh"
-        wrapper_script.chmod(0o755)
+        stage_readonly(input_fasta, input_file)
 
         # Run prediction
         print(f"Running protein solubility prediction on {input_fasta}...")
@@ -145,7 +110,7 @@ def parse_results_csv(csv_file):
         pandas.DataFrame: Parsed results
     """
     try:
-        df = pd.read_csv(csv_file)
+        df = pd.read_csv(csv_file, dtype=RESULT_DTYPES, engine='c')
         return df
     except Exception as e:
         print(f"Error parsing CSV file: {e}")
@@ -214,7 +179,9 @@ The CSV file contains:
             print(f"\nResults summary:")
             df = parse_results_csv(output_files['csv'])
             if df is not None:
-                print(df.to_string(index=False))
+                # Stream through the C CSV writer instead of building one big string
+                sys.stdout.flush()
+                df.to_csv(sys.stdout, sep='\t', index=False, float_format='%.3f')
 
     except Exception as e:
         print(f"Error: {e}")
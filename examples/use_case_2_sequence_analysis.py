@@ -10,29 +10,64 @@ Usage:
     python use_case_2_sequence_analysis.py --sequence "MVKVYAPASSANMSVGFDVL"
 """
 
+import io
 import os
 import sys
 import argparse
 import subprocess
 import tempfile
 import shutil
+import numpy as np
 import pandas as pd
 from pathlib import Path
-import re
 
+from pipeline_common import COMPOSITION_FILES, REPO_DIR, stage_readonly
 
-def write_fasta(sequence, identifier, output_file):
+
+# The pipeline checkout is checked once at import
+REPO_DIR_EXISTS = REPO_DIR.exists()
+
+# Canonical amino acid alphabet used for sequence validation
+VALID_AMINO_ACIDS = b'ACDEFGHIKLMNPQRSTVWY'
+
+
+def is_valid_sequence(sequence):
     """
-    Write a sequence to a FASTA file.
+    Check that a sequence only contains canonical amino acids.
 
     Args:
         sequence (str): Protein sequence
-        identifier (str): Sequence identifier
+
+    Returns:
+        bool: True if the sequence is non-empty and valid
+    """
+    seq_bytes = sequence.upper().encode('ascii', errors='replace')
+    # Deleting every valid residue leaves only the offending characters
+    return bool(seq_bytes) and not seq_bytes.translate(None, VALID_AMINO_ACIDS)
+
+
+def write_fasta(sequence, identifier, output_file):
+    """
+    Write one or more sequences to a FASTA file.
+
+    Args:
+        sequence (str or iterable): Protein sequence, or an iterable of sequences
+        identifier (str or iterable): Sequence identifier, or an iterable matching sequence
         output_file (str): Output FASTA file path
     """
-    with open(output_file, 'w') as f:
-        f.write(f">{identifier}\n")
-        f.write(f"{sequence}\n")
+    if isinstance(sequence, str):
+        data = f">{identifier}\n{sequence}\n".encode('ascii')
+    else:
+        data = ''.join(f">{i}\n{s}\n" for i, s in zip(identifier, sequence)).encode('ascii')
+
+    # Build the whole buffer up front and hand it to the kernel in one write
+    fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def analyze_sequence_composition(input_fasta, output_prefix=None):
@@ -49,29 +84,18 @@ def analyze_sequence_composition(input_fasta, output_prefix=None):
     if output_prefix is None:
         output_prefix = Path(input_fasta).stem
 
-    # Get the script directory
-    script_dir = Path(__file__).parent.parent
-    repo_dir = script_dir / "repo" / "protein-sol"
-
-    if not repo_dir.exists():
-        raise FileNotFoundError(f"Protein-sol repository not found at {repo_dir}")
+    if not REPO_DIR_EXISTS:
+        raise FileNotFoundError(f"Protein-sol repository not found at {REPO_DIR}")
 
     # Create temporary working directory
     working_dir = tempfile.mkdtemp(prefix="protein_composition_")
 
     try:
-        # Copy required files
-        required_files = [
-            "seq_compositions_perc_pipeline_export.pl",
-            "seq_props_ALL_export.pl",
-            "ss_propensities.txt"
-        ]
-
-        for file in required_files:
-            src = repo_dir / file
-            dst = Path(working_dir) / file
+        # Link the support files in; the scripts only read them
+        for file in COMPOSITION_FILES:
+            src = REPO_DIR / file
             if src.exists():
-                shutil.copy2(src, dst)
+                stage_readonly(src, Path(working_dir) / file)
 
         # Copy and rename input file for pipeline
         composition_input = Path(working_dir) / "composition.in"
@@ -134,25 +158,23 @@ def parse_composition_results(comp_file):
         dict: Parsed composition data
     """
     results = {}
-    current_id = None
 
     try:
-        with open(comp_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('>'):
-                    current_id = line[1:]
-                    results[current_id] = {}
-                elif line and current_id:
-                    # Parse composition data
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        try:
-                            key = parts[0]
-                            value = float(parts[1])
-                            results[current_id][key] = value
-                        except ValueError:
-                            continue
+        text = Path(comp_file).read_text()
+
+        # Split into per-sequence records; anything before the first header is skipped
+        for record in ('\n' + text).split('\n>')[1:]:
+            header, _, body = record.partition('\n')
+            current_id = header.strip()
+            results[current_id] = {}
+            if not body.strip():
+                continue
+
+            # Parse the key/value block with the C parser
+            df = pd.read_csv(io.StringIO(body), sep=r'\s+', header=None,
+                             usecols=[0, 1], names=['key', 'value'], engine='c')
+            df['value'] = pd.to_numeric(df['value'], errors='coerce').astype(float)
+            results[current_id] = df.dropna().set_index('key')['value'].to_dict()
 
     except Exception as e:
         print(f"Error parsing composition file: {e}")
@@ -171,11 +193,10 @@ def calculate_basic_properties(sequence):
     Returns:
         dict: Basic properties
     """
-    # Amino acid counts
-    aa_counts = {}
-    for aa in sequence.upper():
-        if aa.isalpha():
-            aa_counts[aa] = aa_counts.get(aa, 0) + 1
+    # Amino acid counts in a single pass over the byte values
+    buf = np.frombuffer(sequence.upper().encode('ascii'), dtype=np.uint8)
+    counts = np.bincount(buf, minlength=256)
+    aa_counts = {chr(i): int(counts[i]) for i in range(ord('A'), ord('Z') + 1) if counts[i] > 0}
 
     length = len(sequence)
 
@@ -183,15 +204,15 @@ def calculate_basic_properties(sequence):
     aa_percentages = {aa: count/length * 100 for aa, count in aa_counts.items()}
 
     # Hydrophobic residues
-    hydrophobic = 'AILMFPWV'
-    hydrophobic_count = sum(aa_counts.get(aa, 0) for aa in hydrophobic)
+    hydrophobic = b'AILMFPWV'
+    hydrophobic_count = int(counts[list(hydrophobic)].sum())
     hydrophobic_pct = hydrophobic_count / length * 100
 
     # Charged residues
-    positive = 'KR'
-    negative = 'DE'
-    positive_count = sum(aa_counts.get(aa, 0) for aa in positive)
-    negative_count = sum(aa_counts.get(aa, 0) for aa in negative)
+    positive = b'KR'
+    negative = b'DE'
+    positive_count = int(counts[list(positive)].sum())
+    negative_count = int(counts[list(negative)].sum())
     net_charge = positive_count - negative_count
 
     return {
@@ -251,69 +272,61 @@ The analysis provides:
         print("Error: Cannot specify both --input and --sequence")
         sys.exit(1)
 
-    # Prepare input
+    # Validate input
     if args.sequence:
-        # Validate sequence
-        if not re.match(r'^[ACDEFGHIKLMNPQRSTVWY]+$', args.sequence.upper()):
+        if not is_valid_sequence(args.sequence):
             print("Error: Invalid amino acid sequence")
             sys.exit(1)
-
-        # Create temporary FASTA file
-        temp_fasta = tempfile.NamedTemporaryFile(mode='w', suffix='.fasta', delete=False)
-        write_fasta(args.sequence, args.id, temp_fasta.name)
-        temp_fasta.close()
-        input_file = temp_fasta.name
-        cleanup_temp = True
-    else:
-        if not Path(args.input).exists():
-            print(f"Error: Input file {args.input} not found")
-            sys.exit(1)
-        input_file = args.input
-        cleanup_temp = False
-
-    try:
-        output_prefix = args.output or (args.id if args.sequence else Path(input_file).stem)
-
-        # Basic properties for single sequence
-        if args.sequence:
-            print(f"Basic properties for sequence '{args.id}':")
-            props = calculate_basic_properties(args.sequence)
-            print(f"Length: {props['length']} amino acids")
-            print(f"Hydrophobic residues: {props['hydrophobic_percentage']:.1f}%")
-            print(f"Positive charges: {props['positive_charges']}")
-            print(f"Negative charges: {props['negative_charges']}")
-            print(f"Net charge: {props['net_charge']:+d}")
-            print(f"Most common AA: {max(props['aa_counts'], key=props['aa_counts'].get) if props['aa_counts'] else 'N/A'}")
-
-        # Run detailed analysis unless basic-only
-        if not args.basic_only:
-            output_files = analyze_sequence_composition(input_file, output_prefix)
-
-            if output_files:
-                print(f"\nDetailed analysis completed!")
-                print(f"Output files:")
-                for file_type, path in output_files.items():
-                    print(f"  {file_type}: {path}")
-
-                # Parse and show summary
-                if 'composition' in output_files:
-                    comp_data = parse_composition_results(output_files['composition'])
-                    if comp_data:
-                        print(f"\nComposition summary:")
-                        for seq_id, data in comp_data.items():
-                            print(f"  {seq_id}: {len(data)} features analyzed")
-            else:
-                print("Analysis failed")
-                sys.exit(1)
-
-    except Exception as e:
-        print(f"Error: {e}")
+    elif not Path(args.input).exists():
+        print(f"Error: Input file {args.input} not found")
         sys.exit(1)
 
-    finally:
-        if cleanup_temp and 'temp_fasta' in locals():
-            os.unlink(temp_fasta.name)
-
+    # Temporary directory is removed on exit, including early sys.exit() calls
+    with tempfile.TemporaryDirectory(prefix='protein_sol_') as tmp:
+        if args.sequence:
+            input_file = str(Path(tmp) / 'in.fasta')
+            write_fasta(args.sequence, args.id, input_file)
+        else:
+            input_file = args.input
+
+        try:
+            output_prefix = args.output or (args.id if args.sequence else Path(input_file).stem)
+
+            # Basic properties for single sequence
+            if args.sequence:
+                print(f"Basic properties for sequence '{args.id}':")
+                props = calculate_basic_properties(args.sequence)
+                print(f"Length: {props['length']} amino acids")
+                print(f"Hydrophobic residues: {props['hydrophobic_percentage']:.1f}%")
+                print(f"Positive charges: {props['positive_charges']}")
+                print(f"Negative charges: {props['negative_charges']}")
+                print(f"Net charge: {props['net_charge']:+d}")
+                print(f"Most common AA: {max(props['aa_counts'], key=props['aa_counts'].get) if props['aa_counts'] else 'N/A'}")
+
+            # Run detailed analysis unless basic-only
+            if not args.basic_only:
+                output_files = analyze_sequence_composition(input_file, output_prefix)
+
+                if output_files:
+                    print(f"\nDetailed analysis completed!")
+                    print(f"Output files:")
+                    for file_type, path in output_files.items():
+                        print(f"  {file_type}: {path}")
+
+                    # Parse and show summary
+                    if 'composition' in output_files:
+                        comp_data = parse_composition_results(output_files['composition'])
+                        if comp_data:
+                            print(f"\nComposition summary:")
+                            for seq_id, data in comp_data.items():
+                                print(f"  {seq_id}: {len(data)} features analyzed")
+                else:
+                    print("Analysis failed")
+                    sys.exit(1)
+
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
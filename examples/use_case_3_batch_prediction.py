@@ -10,6 +10,7 @@ Usage:
     python use_case_3_batch_prediction.py --files file1.fasta file2.fasta
 """
 
+import asyncio
 import os
 import sys
 import argparse
@@ -18,9 +19,33 @@ import tempfile
 import shutil
 import pandas as pd
 from pathlib import Path
-import glob
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import time
+import hashlib
+
+from pipeline_common import REPO_DIR, REQUIRED_FILES, RESULT_DTYPES, prepare_shared_workspace, stage_readonly
+from lib.io import read_prediction_rows
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+
+# Common FASTA extensions
+FASTA_EXTENSIONS = {'.fasta', '.fa', '.fas', '.faa', '.seq'}
+
+# Residues accepted by the pipeline (blanks and stop asterisks are ignored)
+VALID_RESIDUES = b'ACDEFGHIKLMNPQRSTVWY *'
+
+# Columns of the per-file results CSV
+RESULT_COLUMNS = ['ID', 'sequence', 'percent-sol', 'scaled-sol', 'population-sol', 'pI']
 
 
 def find_fasta_files(input_path):
@@ -38,93 +63,82 @@ def find_fasta_files(input_path):
     if path.is_file():
         return [str(path)]
     elif path.is_dir():
-        fasta_files = []
-        # Common FASTA extensions
-        extensions = ['*.fasta', '*.fa', '*.fas', '*.faa', '*.seq']
-
-        for ext in extensions:
-            fasta_files.extend(path.glob(ext))
-            fasta_files.extend(path.glob(f"**/{ext}"))  # Recursive
-
-        return [str(f) for f in fasta_files]
+        # Single recursive walk with an O(1) extension check; the set guards
+        # against processing the same file twice
+        return sorted({str(f) for f in path.rglob('*')
+                       if f.suffix.lower() in FASTA_EXTENSIONS and f.is_file()})
     else:
         return []
 
 
-def process_single_file(fasta_file, output_dir, repo_dir):
+async def process_single_file(fasta_file, output_dir, staging_root, verbose=False):
     """
     Process a single FASTA file.
 
+    The pipeline subprocess is awaited on the event loop, so many jobs can
+    run concurrently from a single Python process.
+
     Args:
         fasta_file (str): Path to FASTA file
         output_dir (str): Output directory
-        repo_dir (str): Repository directory
+        staging_root (str): Shared directory holding the pipeline support files
+        verbose (bool): Pass pipeline stdout through instead of discarding it
 
     Returns:
         dict: Processing results
     """
+    staging_root = Path(staging_root)
     try:
         file_stem = Path(fasta_file).stem
         print(f"Processing: {fasta_file}")
 
-        # Create working directory
-        working_dir = tempfile.mkdtemp(prefix=f"protein_sol_{file_stem}_")
-
-        # Copy required files
-        required_files = [
-            "multiple_prediction_wrapper_export.sh",
-            "fasta_seq_reformat_export.pl",
-            "seq_compositions_perc_pipeline_export.pl",
-            "server_prediction_seq_export.pl",
-            "seq_props_ALL_export.pl",
-            "profiles_gather_export.pl",
-            "ss_propensities.txt",
-            "seq_reference_data.txt"
-        ]
-
-        for file in required_files:
-            src = repo_dir / file
-            dst = Path(working_dir) / file
+        # Create per-job working directory inside the shared staging tree
+        working_dir = tempfile.mkdtemp(prefix=f"job_{file_stem}_", dir=staging_root)
+
+        # Link the shared support files instead of copying them per job
+        for file in REQUIRED_FILES:
+            src = staging_root / file
             if src.exists():
-                shutil.copy2(src, dst)
+                os.symlink(src, Path(working_dir) / file)
 
-        # Copy input file
+        # Link input file into working directory
         input_file = Path(working_dir) / "input.fasta"
-        shutil.copy2(fasta_file, input_file)
-
-        # Make executable
-        wrapper_script = Path(working_dir) / "multiple_prediction_wrapper_export.sh"
-        wrapper_script.chmod(0o755)
+        stage_readonly(fasta_file, input_file)
 
         # Run prediction
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         cmd = ["bash", "multiple_prediction_wrapper_export.sh", "input.fasta"]
-        result = subprocess.run(cmd, cwd=working_dir, capture_output=True, text=True)
-        end_time = time.time()
-
-        if result.returncode != 0:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=working_dir,
+            stdout=None if verbose else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE)
+        _, stderr = await proc.communicate()
+        end_time = time.perf_counter_ns()
+
+        if proc.returncode != 0:
             return {
                 'file': fasta_file,
                 'status': 'failed',
-                'error': result.stderr,
-                'processing_time': end_time - start_time
+                'error': stderr.decode(errors='replace'),
+                'processing_time_ns': end_time - start_time
             }
 
-        # Copy results
-        output_files = {}
-        base_name = "input.fasta"
-
-        csv_file = Path(working_dir) / f"{base_name}-protein_sol.csv"
-        if csv_file.exists():
-            output_csv = Path(output_dir) / f"{file_stem}_solubility_results.csv"
-            shutil.copy2(csv_file, output_csv)
-            output_files['csv'] = str(output_csv)
+        # Build the results CSV from the wrapper's seq_prediction.txt
+        df = read_predictions(working_dir)
+        if df.empty:
+            shutil.rmtree(working_dir)
+            return {
+                'file': fasta_file,
+                'status': 'failed',
+                'error': 'No predictions produced',
+                'processing_time_ns': end_time - start_time
+            }
 
-        prediction_file = Path(working_dir) / f"{base_name}-protein_sol_prediction.txt"
-        if prediction_file.exists():
-            output_pred = Path(output_dir) / f"{file_stem}_detailed_prediction.txt"
-            shutil.copy2(prediction_file, output_pred)
-            output_files['prediction'] = str(output_pred)
+        output_csv = Path(output_dir) / f"{file_stem}_solubility_results.csv"
+        df.to_csv(output_csv, index=False, float_format='%.3f')
+        output_pred = Path(output_dir) / f"{file_stem}_detailed_prediction.txt"
+        shutil.copy2(Path(working_dir) / "seq_prediction.txt", output_pred)
+        output_files = {'csv': str(output_csv), 'prediction': str(output_pred)}
 
         # Clean up
         shutil.rmtree(working_dir)
@@ -133,7 +147,7 @@ def process_single_file(fasta_file, output_dir, repo_dir):
             'file': fasta_file,
             'status': 'success',
             'output_files': output_files,
-            'processing_time': end_time - start_time
+            'processing_time_ns': end_time - start_time
         }
 
     except Exception as e:
@@ -141,28 +155,267 @@ def process_single_file(fasta_file, output_dir, repo_dir):
             'file': fasta_file,
             'status': 'failed',
             'error': str(e),
-            'processing_time': 0
+            'processing_time_ns': 0
         }
 
 
+def read_predictions(working_dir):
+    """
+    Read the predictions of a finished wrapper run.
+
+    Args:
+        working_dir (str): Directory the wrapper ran in
+
+    Returns:
+        DataFrame: RESULT_COLUMNS rows (empty if nothing was predicted)
+    """
+    working_dir = Path(working_dir)
+    prediction_file = working_dir / "seq_prediction.txt"
+    rows = read_prediction_rows(prediction_file) if prediction_file.exists() else []
+    df = pd.DataFrame(rows, columns=['ID', 'percent-sol', 'scaled-sol', 'population-sol', 'pI'])
+
+    # Reformatted sequences (two lines per record), keyed by the ID the
+    # pipeline reports: the first token of the header
+    sequences = {}
+    with open(working_dir / "input.fasta") as f:
+        for header, seq in zip(f, f):
+            sequences[header[1:].split()[0]] = seq.strip()
+
+    df['sequence'] = df['ID'].map(sequences)
+    df[RESULT_COLUMNS[2:]] = df[RESULT_COLUMNS[2:]].apply(pd.to_numeric)
+    return df[RESULT_COLUMNS]
+
+
+def fasta_is_valid(fasta_file):
+    """
+    Check that every sequence line in a FASTA file holds only valid residues.
+
+    Args:
+        fasta_file (str): Path to FASTA file
+
+    Returns:
+        bool: True if all records can go through the batched pipeline
+    """
+    with open(fasta_file, 'rb') as f:
+        for line in f:
+            if line.startswith(b'>'):
+                continue
+            if line.strip().upper().translate(None, VALID_RESIDUES):
+                return False
+    return True
+
+
+def process_batch(fasta_files, output_dir, staging_root, verbose=False):
+    """
+    Process several FASTA files with a single pipeline invocation.
+
+    Records from every input are concatenated into one FASTA with their
+    headers tagged by source index, the wrapper runs once, and the
+    predictions are split back out per source file.
+
+    Args:
+        fasta_files (list): Paths to FASTA files
+        output_dir (str): Output directory
+        staging_root (str): Shared directory holding the pipeline support files
+        verbose (bool): Pass pipeline stdout through instead of discarding it
+
+    Returns:
+        list: Processing results per file, or None if the pipeline failed
+    """
+    staging_root = Path(staging_root)
+    start_time = time.perf_counter_ns()
+
+    working_dir = Path(tempfile.mkdtemp(prefix="job_batch_", dir=staging_root))
+    try:
+        for file in REQUIRED_FILES:
+            src = staging_root / file
+            if src.exists():
+                os.symlink(src, working_dir / file)
+
+        # Concatenate all inputs, tagging each header with its source index
+        with open(working_dir / "input.fasta", 'w') as out:
+            for j, fasta_file in enumerate(fasta_files):
+                with open(fasta_file) as f:
+                    for line in f:
+                        if line.startswith('>'):
+                            line = f">BATCH{j}_{line[1:]}"
+                        out.write(line)
+                out.write("\n")
+
+        print(f"Processing {len(fasta_files)} files in a single pipeline run...")
+        cmd = ["bash", "multiple_prediction_wrapper_export.sh", "input.fasta"]
+        result = subprocess.run(cmd, cwd=working_dir,
+                                stdout=None if verbose else subprocess.DEVNULL,
+                                stderr=subprocess.PIPE)
+        prediction_file = working_dir / "seq_prediction.txt"
+        if result.returncode != 0 or not prediction_file.exists():
+            print("Batched pipeline failed, falling back to per-file mode: "
+                  f"{result.stderr.decode(errors='replace')}")
+            return None
+
+        # Predictions keyed by tagged ID; demultiplex by the source tag
+        df = read_predictions(working_dir)
+        tag = df['ID'].str.extract(r'^BATCH(\d+)_', expand=False).astype(int)
+        df['ID'] = df['ID'].str.replace(r'^BATCH\d+_', '', regex=True)
+        groups = dict(tuple(df.groupby(tag)))
+
+        processing_time_ns = (time.perf_counter_ns() - start_time) // len(fasta_files)
+        results = []
+        for j, fasta_file in enumerate(fasta_files):
+            if j not in groups:
+                results.append({
+                    'file': fasta_file,
+                    'status': 'failed',
+                    'error': 'No predictions produced',
+                    'processing_time_ns': processing_time_ns
+                })
+                continue
+            output_csv = Path(output_dir) / f"{Path(fasta_file).stem}_solubility_results.csv"
+            groups[j][RESULT_COLUMNS].to_csv(output_csv, index=False, float_format='%.3f')
+            results.append({
+                'file': fasta_file,
+                'status': 'success',
+                'output_files': {'csv': str(output_csv)},
+                'processing_time_ns': processing_time_ns
+            })
+        return results
+
+    finally:
+        shutil.rmtree(working_dir, ignore_errors=True)
+
+
+# Bump when the way this script turns pipeline output into a results CSV
+# changes, so results cached by an older version are not reused
+RESULTS_FORMAT_VERSION = 1
+
+
+def pipeline_version(repo_dir):
+    """
+    Fingerprint the pipeline that produces cached results.
+
+    Covers every script and data file the pipeline reads, plus this script's
+    RESULTS_FORMAT_VERSION, so editing any of them invalidates the cache.
+
+    Args:
+        repo_dir (str): Directory holding the pipeline support files
+
+    Returns:
+        str: Hex digest identifying the pipeline version
+    """
+    h = hashlib.blake2b(f"results-v{RESULTS_FORMAT_VERSION}".encode(), digest_size=16)
+    for name in REQUIRED_FILES:
+        h.update(name.encode())
+        path = Path(repo_dir) / name
+        h.update(path.read_bytes() if path.exists() else b"missing")
+    return h.hexdigest()
+
+
+def file_digest(fasta_file, version=""):
+    """
+    Hash the contents of a FASTA file for the result cache.
+
+    Uses xxhash when installed, falling back to BLAKE2b.
+
+    Args:
+        fasta_file (str): Path to FASTA file
+        version (str): Pipeline version from pipeline_version(), mixed into
+            the key so results from another pipeline version never match
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    data = version.encode() + Path(fasta_file).read_bytes()
+    if xxhash is not None:
+        return xxhash.xxh3_64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def link_cached_result(cache_file, output_csv):
+    """Point output_csv at a cached results CSV, copying if symlinks fail."""
+    if output_csv.is_symlink() or output_csv.exists():
+        output_csv.unlink()
+    try:
+        os.symlink(cache_file.resolve(), output_csv)
+    except OSError:
+        shutil.copy2(cache_file, output_csv)
+
+
+def log_result(result):
+    """Print a one-line progress update for a processed file."""
+    if result['status'] == 'success':
+        print(f"✓ {Path(result['file']).name} completed in {result['processing_time_ns'] / 1e9:.1f}s")
+    else:
+        print(f"✗ {Path(result['file']).name} failed: {result.get('error', 'Unknown error')}")
+
+
+async def process_files(fasta_files, output_dir, staging_root, workers, verbose=False):
+    """
+    Run the per-file pipeline for many files with bounded concurrency.
+
+    Args:
+        fasta_files (list): Paths to FASTA files
+        output_dir (str): Output directory
+        staging_root (str): Shared directory holding the pipeline support files
+        workers (int): Maximum number of concurrent pipeline subprocesses
+        verbose (bool): Pass pipeline stdout through instead of discarding it
+
+    Returns:
+        list: Processing results in completion order
+    """
+    semaphore = asyncio.Semaphore(workers)
+
+    async def bounded(fasta_file):
+        async with semaphore:
+            return await process_single_file(fasta_file, output_dir, staging_root, verbose)
+
+    results = []
+    for next_result in asyncio.as_completed([bounded(f) for f in fasta_files]):
+        result = await next_result
+        results.append(result)
+        log_result(result)
+    return results
+
+
+def _read_result_csv(csv_file):
+    """Read one results CSV into a DataFrame tagged with its source file."""
+    try:
+        df = pd.read_csv(csv_file, dtype=RESULT_DTYPES, engine='c')
+        # Add source file column
+        df['source_file'] = Path(csv_file).stem.replace('_solubility_results', '')
+        return df
+    except Exception as e:
+        print(f"Warning: Could not read {csv_file}: {e}")
+        return None
+
+
+def _read_result_table(csv_file, convert_options):
+    """Read one results CSV into an Arrow table tagged with its source file."""
+    try:
+        table = pacsv.read_csv(csv_file, convert_options=convert_options)
+        # Add source file column
+        source = Path(csv_file).stem.replace('_solubility_results', '')
+        return table.append_column('source_file', pa.array([source] * table.num_rows))
+    except Exception as e:
+        print(f"Warning: Could not read {csv_file}: {e}")
+        return None
+
+
 def combine_results(csv_files, output_file):
     """
     Combine multiple CSV results into a single file.
 
+    Files are read on a small thread pool; the CSV parsers release the GIL,
+    so disk reads and parsing of different files overlap.
+
     Args:
         csv_files (list): List of CSV file paths
         output_file (str): Output combined CSV file
     """
-    all_data = []
+    if pa is not None:
+        return _combine_results_arrow(csv_files, output_file)
 
-    for csv_file in csv_files:
-        try:
-            df = pd.read_csv(csv_file)
-            # Add source file column
-            df['source_file'] = Path(csv_file).stem.replace('_solubility_results', '')
-            all_data.append(df)
-        except Exception as e:
-            print(f"Warning: Could not read {csv_file}: {e}")
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(csv_files)))) as executor:
+        all_data = [df for df in executor.map(_read_result_csv, csv_files) if df is not None]
 
     if all_data:
         combined_df = pd.concat(all_data, ignore_index=True)
@@ -172,6 +425,32 @@ def combine_results(csv_files, output_file):
         return None
 
 
+def _combine_results_arrow(csv_files, output_file):
+    """
+    Combine CSV results with pyarrow, writing the combined table directly.
+
+    Args:
+        csv_files (list): List of CSV file paths
+        output_file (str): Output combined CSV file
+    """
+    convert_options = pacsv.ConvertOptions(column_types={
+        col: pa.string() if dtype == 'string' else pa.float32()
+        for col, dtype in RESULT_DTYPES.items()
+    })
+
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(csv_files)))) as executor:
+        tables = [table for table in executor.map(
+            lambda f: _read_result_table(f, convert_options), csv_files) if table is not None]
+
+    if not tables:
+        return None
+
+    combined = pa.concat_tables(tables)
+    pacsv.write_csv(combined, output_file,
+                    write_options=pacsv.WriteOptions(quoting_style='needed'))
+    return combined.to_pandas()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Batch processing of protein solubility predictions",
@@ -184,8 +463,8 @@ Examples:
   # Process specific files
   python use_case_3_batch_prediction.py --files file1.fasta file2.fasta
 
-  # Parallel processing with custom number of workers
-  python use_case_3_batch_prediction.py --input data/ --workers 4
+  # Per-file parallel processing with custom number of workers
+  python use_case_3_batch_prediction.py --input data/ --per-file --workers 4
 
 Output:
   Creates individual result files for each input file plus:
@@ -199,8 +478,14 @@ Output:
                        help="Specific FASTA files to process")
     parser.add_argument("--output", "-o", default="batch_results",
                        help="Output directory (default: batch_results)")
-    parser.add_argument("--workers", "-w", type=int, default=2,
-                       help="Number of parallel workers (default: 2)")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count(),
+                       help="Number of concurrent pipeline runs (default: CPU count)")
+    parser.add_argument("--per-file", action="store_true",
+                       help="Run the pipeline separately for each file instead of one batched run")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                       help="Show Perl pipeline output")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Do not reuse or store results keyed by input file content")
     parser.add_argument("--combine", action="store_true", default=True,
                        help="Combine all results into single CSV (default: True)")
 
@@ -222,6 +507,9 @@ Output:
             else:
                 print(f"Warning: File {file} not found")
 
+    # Drop files listed by both --input and --files
+    fasta_files = list(dict.fromkeys(fasta_files))
+
     if not fasta_files:
         print("Error: No FASTA files found")
         sys.exit(1)
@@ -232,44 +520,96 @@ Output:
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Get repository directory
-    script_dir = Path(__file__).parent.parent
-    repo_dir = script_dir / "repo" / "protein-sol"
-
-    if not repo_dir.exists():
-        print(f"Error: Protein-sol repository not found at {repo_dir}")
+    # Stage the support files once for the whole batch
+    try:
+        staging_root = prepare_shared_workspace(REPO_DIR, prefix="protein_sol_batch_")
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
     # Process files
-    results = []
-    failed_files = []
-    successful_files = []
-
-    print(f"Processing with {args.workers} parallel workers...")
+    results = None
+
+    start_time = time.perf_counter_ns()
+
+    # Content-addressed cache: only the first file for each unseen digest runs.
+    # Keys include the pipeline version, so edited scripts give fresh results
+    cache_dir = output_dir / ".cache"
+    digests = {}
+    pending = fasta_files
+    if not args.no_cache:
+        cache_dir.mkdir(exist_ok=True)
+        version = pipeline_version(staging_root)
+        digests = {f: file_digest(f, version) for f in fasta_files}
+        seen = set()
+        pending = []
+        for fasta_file in fasta_files:
+            digest = digests[fasta_file]
+            if digest not in seen and not (cache_dir / f"{digest}.csv").exists():
+                pending.append(fasta_file)
+            seen.add(digest)
+        if len(pending) < len(fasta_files):
+            print(f"Reusing cached results for {len(fasta_files) - len(pending)} files")
+
+    # Never write new results through a link into the cache
+    for fasta_file in pending:
+        output_csv = output_dir / f"{Path(fasta_file).stem}_solubility_results.csv"
+        if output_csv.is_symlink():
+            output_csv.unlink()
 
-    start_time = time.time()
-
-    with ThreadPoolExecutor(max_workers=args.workers) as executor:
-        # Submit all jobs
-        futures = {
-            executor.submit(process_single_file, fasta_file, output_dir, repo_dir): fasta_file
-            for fasta_file in fasta_files
-        }
-
-        # Collect results
-        for future in as_completed(futures):
-            result = future.result()
+    try:
+        # One pipeline run for the whole batch amortizes the Perl start-up cost
+        if pending and not args.per_file and all(fasta_is_valid(f) for f in pending):
+            results = process_batch(pending, str(output_dir), str(staging_root), args.verbose)
+            if results is not None:
+                for result in results:
+                    log_result(result)
+
+        if pending and results is None:
+            print(f"Processing with {args.workers} parallel workers...")
+            results = asyncio.run(process_files(
+                pending, str(output_dir), str(staging_root), args.workers, args.verbose))
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+
+    results = results or []
+
+    if not args.no_cache:
+        # Store fresh results, then serve every other file from the cache
+        for result in results:
+            if result['status'] == 'success' and 'csv' in result['output_files']:
+                shutil.copy2(result['output_files']['csv'], cache_dir / f"{digests[result['file']]}.csv")
+
+        processed = set(pending)
+        for fasta_file in fasta_files:
+            if fasta_file in processed:
+                continue
+            cache_file = cache_dir / f"{digests[fasta_file]}.csv"
+            if cache_file.exists():
+                output_csv = output_dir / f"{Path(fasta_file).stem}_solubility_results.csv"
+                link_cached_result(cache_file, output_csv)
+                result = {
+                    'file': fasta_file,
+                    'status': 'success',
+                    'output_files': {'csv': str(output_csv)},
+                    'processing_time_ns': 0,
+                    'cached': True
+                }
+            else:
+                result = {
+                    'file': fasta_file,
+                    'status': 'failed',
+                    'error': 'No result available for duplicate input',
+                    'processing_time_ns': 0
+                }
             results.append(result)
+            log_result(result)
 
-            if result['status'] == 'success':
-                successful_files.append(result['file'])
-                print(f"✓ {Path(result['file']).name} completed in {result['processing_time']:.1f}s")
-            else:
-                failed_files.append(result['file'])
-                print(f"✗ {Path(result['file']).name} failed: {result.get('error', 'Unknown error')}")
+    successful_files = [r['file'] for r in results if r['status'] == 'success']
+    failed_files = [r['file'] for r in results if r['status'] != 'success']
 
-    end_time = time.time()
-    total_time = end_time - start_time
+    end_time = time.perf_counter_ns()
+    total_time = (end_time - start_time) / 1e9
 
     # Combine results if requested
     combined_df = None
@@ -19,16 +19,20 @@ Example:
 # Minimal Imports (only essential packages)
 # ==============================================================================
 import argparse
+import atexit
+import os
 import sys
 import tempfile
-import re
+import threading
 from pathlib import Path
-from typing import Union, Optional, Dict, Any
+from typing import Union, Optional, Dict, Any, List, Tuple
 import json
+import numpy as np
 
 # Local imports (shared library)
-from lib.io import write_fasta, read_fasta
+from lib.io import read_fasta
 from lib.protein_sol import run_composition_analysis
+from lib.composition_numba import pack_sequences, compute_all
 
 # ==============================================================================
 # Configuration (extracted from use case)
@@ -40,41 +44,68 @@ DEFAULT_CONFIG = {
     "output_format": "txt"
 }
 
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# One temp FASTA per worker thread, rewritten in place for each request
+_worker_fasta = threading.local()
+
 # ==============================================================================
 # Inlined Utility Functions (simplified from repo)
 # ==============================================================================
 def calculate_basic_stats(sequence: str) -> Dict[str, Any]:
-    """Calculate basic sequence statistics. Inlined from repo analysis."""
-    # Remove any whitespace and convert to uppercase
-    seq = re.sub(r'\s+', '', sequence.upper())
+    """Calculate basic statistics for one sequence (see calculate_basic_stats_batch)."""
+    # Remove any whitespace; the batch pass upper-cases
+    return calculate_basic_stats_batch([(None, ''.join(sequence.split()))])[None]
+
+def calculate_basic_stats_batch(sequences: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+    """Calculate basic statistics for many sequences with one fused counting pass."""
+    ids = [seq_id for seq_id, _ in sequences]
+    buf, offsets = pack_sequences(seq.upper() for _, seq in sequences)
+    counts, props = compute_all(buf, offsets)
+    lengths, totals, hydrophobic, charged, polar = props.T
+
+    # Whole-batch arithmetic; empty sequences get 0 without a per-row branch
+    safe_totals = np.where(totals > 0, totals, 1)
+    percents = np.where(totals > 0, props[:, 2:].T / safe_totals * 100, 0.0)
+    hydrophobic_pct, charged_pct, polar_pct = percents.tolist()
+    molecular_weight = (totals * 110).tolist()  # Approximate
+
+    lengths, hydrophobic, charged, polar = (a.tolist() for a in (lengths, hydrophobic, charged, polar))
+    compositions = counts.tolist()
+
+    results = {}
+    for i, seq_id in enumerate(ids):
+        results[seq_id] = {
+            'length': lengths[i],
+            'molecular_weight': molecular_weight[i],
+            'hydrophobic_residues': hydrophobic[i],
+            'hydrophobic_percent': hydrophobic_pct[i],
+            'charged_residues': charged[i],
+            'charged_percent': charged_pct[i],
+            'polar_residues': polar[i],
+            'polar_percent': polar_pct[i],
+            'amino_acid_composition': dict(zip(AMINO_ACIDS, compositions[i]))
+        }
+    return results
 
-    # Amino acid counts
-    aa_counts = {}
-    for aa in 'ACDEFGHIKLMNPQRSTVWY':
-        aa_counts[aa] = seq.count(aa)
+def _remove_worker_fasta(fd: int, path: str) -> None:
+    """Close and delete a worker's temp FASTA at interpreter exit."""
+    os.close(fd)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
 
-    total_aa = sum(aa_counts.values())
 
-    # Basic properties
-    hydrophobic = 'AILMFPWV'
-    charged = 'DEKR'
-    polar = 'NQSTY'
+def _write_worker_fasta(data: bytes) -> str:
+    """Overwrite this worker thread's reusable temp FASTA with data and return its path."""
+    if not hasattr(_worker_fasta, 'path'):
+        _worker_fasta.fd, _worker_fasta.path = tempfile.mkstemp(suffix='.fasta')
+        atexit.register(_remove_worker_fasta, _worker_fasta.fd, _worker_fasta.path)
 
-    hydrophobic_count = sum(seq.count(aa) for aa in hydrophobic)
-    charged_count = sum(seq.count(aa) for aa in charged)
-    polar_count = sum(seq.count(aa) for aa in polar)
-
-    return {
-        'length': len(seq),
-        'molecular_weight': total_aa * 110,  # Approximate
-        'hydrophobic_residues': hydrophobic_count,
-        'hydrophobic_percent': (hydrophobic_count / total_aa * 100) if total_aa > 0 else 0,
-        'charged_residues': charged_count,
-        'charged_percent': (charged_count / total_aa * 100) if total_aa > 0 else 0,
-        'polar_residues': polar_count,
-        'polar_percent': (polar_count / total_aa * 100) if total_aa > 0 else 0,
-        'amino_acid_composition': aa_counts
-    }
+    os.ftruncate(_worker_fasta.fd, 0)
+    os.pwrite(_worker_fasta.fd, data, 0)
+    return _worker_fasta.path
 
 # ==============================================================================
 # Core Function (main logic extracted from use case)
@@ -90,6 +121,11 @@ def run_analyze_sequence(
     """
     Main function for sequence composition and property analysis.
 
+    Basic statistics for every sequence come from one fused counting pass
+    over a packed byte buffer (see calculate_basic_stats_batch). The
+    composition and properties report files are written by the Perl
+    scripts, which read the FASTA and count residues themselves.
+
     Args:
         input_file: Path to input FASTA file (alternative to sequence)
         sequence: Single protein sequence (alternative to input_file)
@@ -119,10 +155,9 @@ def run_analyze_sequence(
         else:
             output_prefix = sequence_id
 
-        # Create temporary FASTA file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.fasta', delete=False) as tmp:
-            write_fasta(sequence, sequence_id, tmp.name)
-            temp_fasta = tmp.name
+        # Use the sequence directly; a FASTA file is only written if Perl needs one
+        sequences = [(sequence_id, ''.join(sequence.split()))]
+        input_fasta = None
 
     elif input_file:
         # FASTA file mode
@@ -135,17 +170,15 @@ def run_analyze_sequence(
         else:
             output_prefix = input_path.stem
 
-        temp_fasta = str(input_path)
+        sequences = read_fasta(input_path)
+        input_fasta = str(input_path)
 
     else:
         raise ValueError("Either input_file or (sequence + sequence_id) must be provided")
 
     # Basic only mode
     if config['basic_only']:
-        sequences = read_fasta(temp_fasta)
-        results = {}
-        for seq_id, seq in sequences:
-            results[seq_id] = calculate_basic_stats(seq)
+        results = calculate_basic_stats_batch(sequences)
 
         return {
             "result": {
@@ -163,33 +196,28 @@ def run_analyze_sequence(
     output_files = {}
     analysis_result = {}
 
-    try:
-        if config['include_composition'] or config['include_properties']:
-            comp_files = run_composition_analysis(temp_fasta, output_prefix)
-            output_files.update(comp_files)
-            analysis_result['analysis_files'] = comp_files
-
-        # Add basic stats for each sequence
-        sequences = read_fasta(temp_fasta)
-        basic_stats = {}
-        for seq_id, seq in sequences:
-            basic_stats[seq_id] = calculate_basic_stats(seq)
-        analysis_result['basic_stats'] = basic_stats
+    if config['include_composition'] or config['include_properties']:
+        if input_fasta is None:
+            input_fasta = _write_worker_fasta(f">{sequence_id}\n{sequences[0][1]}\n".encode())
 
-        return {
-            "result": analysis_result,
-            "output_files": output_files,
-            "metadata": {
-                "config": config,
-                "sequence_count": len(sequences),
-                "temp_fasta": temp_fasta if sequence else None
-            }
-        }
+        comp_files = run_composition_analysis(input_fasta, output_prefix)
+        output_files.update(comp_files)
+        analysis_result['analysis_files'] = comp_files
 
-    finally:
-        # Clean up temp file if we created one
-        if sequence and Path(temp_fasta).exists():
-            Path(temp_fasta).unlink()
+    # Add basic stats for each sequence
+    analysis_result['basic_stats'] = calculate_basic_stats_batch(sequences)
+
+    return {
+        "result": analysis_result,
+        "output_files": output_files,
+        "metadata": {
+            "config": config,
+            "sequence_count": len(sequences),
+            # The per-thread FASTA is rewritten by the next request, so its
+            # path is not handed out
+            "temp_fasta": None
+        }
+    }
 
 
 # ==============================================================================
@@ -263,13 +291,17 @@ Output files (full mode):
 
         if result['metadata']['config']['basic_only']:
             # Display basic stats immediately
-            print("Basic sequence analysis:")
+            # Build the whole listing first and emit it with a single write
+            lines = ["Basic sequence analysis:"]
             for seq_id, stats in result['result']['basic_stats'].items():
-                print(f"\nSequence: {seq_id}")
-                print(f"  Length: {stats['length']}")
-                print(f"  Hydrophobic: {stats['hydrophobic_percent']:.1f}%")
-                print(f"  Charged: {stats['charged_percent']:.1f}%")
-                print(f"  Polar: {stats['polar_percent']:.1f}%")
+                lines.append(
+                    f"\nSequence: {seq_id}\n"
+                    f"  Length: {stats['length']}\n"
+                    f"  Hydrophobic: {stats['hydrophobic_percent']:.1f}%\n"
+                    f"  Charged: {stats['charged_percent']:.1f}%\n"
+                    f"  Polar: {stats['polar_percent']:.1f}%"
+                )
+            sys.stdout.write('\n'.join(lines) + '\n')
         else:
             print(f"✅ Sequence analysis completed!")
             if result['output_files']:
@@ -19,12 +19,16 @@ Example:
 # Minimal Imports (only essential packages)
 # ==============================================================================
 import argparse
+import os
 import sys
 import time
 from pathlib import Path
 from typing import Union, Optional, Dict, Any, List
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+import numpy as np
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 # Local imports (shared library)
 from lib.io import find_fasta_files
@@ -34,7 +38,7 @@ from lib.protein_sol import run_protein_sol_prediction
 # Configuration (extracted from use case)
 # ==============================================================================
 DEFAULT_CONFIG = {
-    "max_workers": 2,
+    "max_workers": os.cpu_count() or 2,
     "timeout_per_file": 300,  # 5 minutes per file
     "continue_on_error": True,
     "cleanup_temp": True,
@@ -44,7 +48,7 @@ DEFAULT_CONFIG = {
 # ==============================================================================
 # Inlined Utility Functions (simplified from repo)
 # ==============================================================================
-def process_single_file(file_path: str, output_dir: Optional[Path] = None) -> Dict[str, Any]:
+def process_single_file(file_path: str, output_dir: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
     """
     Process a single FASTA file for solubility prediction.
 
@@ -61,7 +65,7 @@ def process_single_file(file_path: str, output_dir: Optional[Path] = None) -> Di
     try:
         # Determine output prefix
         if output_dir:
-            output_prefix = output_dir / file_path.stem
+            output_prefix = Path(output_dir) / file_path.stem
         else:
             output_prefix = file_path.stem
 
@@ -93,36 +97,75 @@ def process_single_file(file_path: str, output_dir: Optional[Path] = None) -> Di
         }
 
 
-def generate_batch_report(results: List[Dict[str, Any]], output_file: str) -> None:
+def prefetch_file(file_path: str) -> None:
+    """Start reading a FASTA file into the page cache ahead of its worker."""
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        else:
+            while os.read(fd, 1 << 20):
+                pass
+    finally:
+        os.close(fd)
+
+
+def summarize_results(results: List[Dict[str, Any]], total_time: Optional[float] = None) -> Dict[str, Any]:
+    """Compute batch summary statistics in one pass over the results."""
+    count = len(results)
+    times = np.fromiter((r['processing_time'] for r in results), dtype=np.float64, count=count)
+    ok = np.fromiter((r['status'] == 'success' for r in results), dtype=bool, count=count)
+
+    successful = int(ok.sum())
+    processing_time = float(times.sum())
+
+    return {
+        'total_files': count,
+        'successful': successful,
+        'failed': count - successful,
+        'success_rate': (successful / count * 100) if count else 0,
+        'total_time': processing_time if total_time is None else total_time,
+        'total_processing_time': processing_time,
+        'average_time': float(times.mean()) if count else 0
+    }
+
+
+def generate_batch_report(
+    results: List[Dict[str, Any]],
+    output_file: str,
+    summary: Optional[Dict[str, Any]] = None
+) -> None:
     """Generate a summary report of batch processing."""
-    total_files = len(results)
-    successful = sum(1 for r in results if r['status'] == 'success')
-    failed = total_files - successful
-    total_time = sum(r['processing_time'] for r in results)
-    avg_time = total_time / total_files if total_files > 0 else 0
+    if summary is None:
+        summary = summarize_results(results)
 
-    report = f"""Batch Processing Report
+    lines = [f"""Batch Processing Report
 ========================
 
-Files Processed: {total_files}
-Successful: {successful}
-Failed: {failed}
-Success Rate: {(successful/total_files*100):.1f}%
+Files Processed: {summary['total_files']}
+Successful: {summary['successful']}
+Failed: {summary['failed']}
+Success Rate: {summary['success_rate']:.1f}%
 
-Total Processing Time: {total_time:.2f} seconds
-Average Time per File: {avg_time:.2f} seconds
+Total Processing Time: {summary['total_processing_time']:.2f} seconds
+Average Time per File: {summary['average_time']:.2f} seconds
 
 Detailed Results:
-"""
+"""]
 
     for result in results:
         status_icon = "✅" if result['status'] == 'success' else "❌"
-        report += f"\n{status_icon} {result['file']} ({result['processing_time']:.2f}s)"
+        line = f"{status_icon} {result['file']} ({result['processing_time']:.2f}s)"
         if result['error']:
-            report += f" - Error: {result['error']}"
+            line += f" - Error: {result['error']}"
+        lines.append(line)
 
     with open(output_file, 'w') as f:
-        f.write(report)
+        f.write('\n'.join(lines))
 
 # ==============================================================================
 # Core Function (main logic extracted from use case)
@@ -175,22 +218,28 @@ def run_batch_predict(
         output_dir_path = Path(output_dir)
         output_dir_path.mkdir(parents=True, exist_ok=True)
 
-    # Process files in parallel
+    # Process files in parallel, one interpreter per worker so the GIL is not shared
     results = []
     start_time = time.time()
 
-    print(f"Processing {len(fasta_files)} files with {config['max_workers']} workers...")
+    # Never start more workers than there are files; idle ones only hold memory
+    workers = max(1, min(config['max_workers'], len(fasta_files)))
+    print(f"Processing {len(fasta_files)} files with {workers} workers...")
 
-    with ThreadPoolExecutor(max_workers=config['max_workers']) as executor:
-        # Submit all jobs
-        future_to_file = {
-            executor.submit(process_single_file, file_path, output_dir_path): file_path
-            for file_path in fasta_files
-        }
+    output_dir_arg = str(output_dir_path) if output_dir_path else None
 
-        # Collect results as they complete
-        for future in as_completed(future_to_file):
-            result = future.result()
+    # forkserver children start clean instead of inheriting the parent's heap
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    chunksize = max(1, len(fasta_files) // (4 * workers))
+
+    # Reader threads pull inputs off storage while workers are busy predicting
+    with ThreadPoolExecutor(max_workers=2) as prefetcher, \
+            multiprocessing.get_context(start_method).Pool(processes=workers) as pool:
+        prefetcher.map(prefetch_file, fasta_files)
+
+        # Stream results as they complete, dispatching files in chunks
+        worker = partial(process_single_file, output_dir=output_dir_arg)
+        for result in pool.imap_unordered(worker, fasta_files, chunksize=chunksize):
             results.append(result)
 
             # Progress update
@@ -198,23 +247,15 @@ def run_batch_predict(
             print(f"{status_icon} {Path(result['file']).name} ({result['processing_time']:.2f}s)")
 
     total_time = time.time() - start_time
-    successful = sum(1 for r in results if r['status'] == 'success')
 
     # Generate summary
-    summary = {
-        'total_files': len(results),
-        'successful': successful,
-        'failed': len(results) - successful,
-        'success_rate': (successful / len(results) * 100) if results else 0,
-        'total_time': total_time,
-        'average_time': sum(r['processing_time'] for r in results) / len(results) if results else 0
-    }
+    summary = summarize_results(results, total_time)
 
     # Generate report if enabled
     report_file = None
     if config['generate_report']:
         report_file = "batch_processing_report.txt"
-        generate_batch_report(results, report_file)
+        generate_batch_report(results, report_file, summary)
 
     return {
         "results": results,
@@ -262,8 +303,8 @@ Output:
     # Other options
     parser.add_argument('--output', '-o',
                        help='Output directory for result files')
-    parser.add_argument('--workers', '-w', type=int, default=2,
-                       help='Number of parallel workers (default: 2)')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_CONFIG['max_workers'],
+                       help='Number of parallel worker processes (default: CPU count)')
     parser.add_argument('--config', '-c',
                        help='Config file (JSON)')
     parser.add_argument('--no-report', action='store_true',
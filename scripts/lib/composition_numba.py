@@ -0,0 +1,107 @@
+"""
+Amino acid counting kernels for batches of protein sequences.
+
+Sequences are packed into one uint8 buffer with an offsets array so a whole
+FASTA file is counted in a single call. The Numba kernel is used when numba
+is installed, otherwise an equivalent NumPy implementation.
+"""
+from typing import Iterable, Tuple
+import numpy as np
+
+try:
+    import numba
+    from numba import prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+
+# ord(residue) -> column 0..19, 255 for anything else (lowercase maps too)
+AA_LUT = np.full(256, 255, dtype=np.uint8)
+AA_LUT[np.frombuffer(AMINO_ACIDS.encode('ascii'), dtype=np.uint8)] = np.arange(20)
+AA_LUT[np.frombuffer(AMINO_ACIDS.lower().encode('ascii'), dtype=np.uint8)] = np.arange(20)
+
+HYDROPHOBIC_COLS = [AMINO_ACIDS.index(aa) for aa in 'AILMFPWV']
+CHARGED_COLS = [AMINO_ACIDS.index(aa) for aa in 'DEKR']
+POLAR_COLS = [AMINO_ACIDS.index(aa) for aa in 'NQSTY']
+
+# Column of the props matrix each residue group is tallied into (-1: none)
+PROP_COLUMNS = ('length', 'total', 'hydrophobic', 'charged', 'polar')
+AA_GROUP = np.full(20, -1, dtype=np.int8)
+AA_GROUP[HYDROPHOBIC_COLS] = 2
+AA_GROUP[CHARGED_COLS] = 3
+AA_GROUP[POLAR_COLS] = 4
+
+
+def pack_sequences(sequences: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenate sequences into one byte buffer.
+
+    Args:
+        sequences: Protein sequences
+
+    Returns:
+        (buf, offsets) where sequence i is buf[offsets[i]:offsets[i + 1]]
+    """
+    encoded = [seq.encode('ascii', 'replace') for seq in sequences]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return buf, offsets
+
+
+def _count_aa_numpy(buf, offsets, lut, groups, out, props) -> None:
+    """NumPy fallback for count_aa: one bincount over (sequence, residue) pairs."""
+    n = len(offsets) - 1
+    codes = lut[buf]
+    rows = np.repeat(np.arange(n), np.diff(offsets))
+    valid = codes != 255
+    flat = rows[valid] * 20 + codes[valid]
+    out += np.bincount(flat, minlength=n * 20).reshape(n, 20).astype(out.dtype)
+
+    props[:, 0] = np.diff(offsets)
+    props[:, 1] = out.sum(axis=1)
+    for col in range(2, len(PROP_COLUMNS)):
+        props[:, col] = out[:, groups == col].sum(axis=1)
+
+
+if _NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def count_aa(buf, offsets, lut, groups, out, props):
+        """Fill residue counts and group totals for every sequence in one pass."""
+        for i in prange(len(offsets) - 1):
+            props[i, 0] = offsets[i + 1] - offsets[i]
+            for j in range(offsets[i], offsets[i + 1]):
+                c = lut[buf[j]]
+                if c != 255:
+                    out[i, c] += 1
+                    props[i, 1] += 1
+                    g = groups[c]
+                    if g >= 0:
+                        props[i, g] += 1
+
+    # Compile up front so the first real batch does not pay for the JIT
+    count_aa(np.zeros(1, dtype=np.uint8), np.array([0, 1], dtype=np.int64), AA_LUT, AA_GROUP,
+             np.zeros((1, 20), dtype=np.int32), np.zeros((1, len(PROP_COLUMNS)), dtype=np.int32))
+else:
+    count_aa = _count_aa_numpy
+
+
+def compute_all(buf: np.ndarray, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count residues and residue-group totals for a packed batch in one pass.
+
+    Args:
+        buf: Concatenated sequence bytes from pack_sequences
+        offsets: Sequence boundaries from pack_sequences
+
+    Returns:
+        (counts, props): an (n, 20) int32 count matrix in AMINO_ACIDS column
+        order and an (n, 5) int32 matrix with PROP_COLUMNS columns
+    """
+    n = len(offsets) - 1
+    counts = np.zeros((n, 20), dtype=np.int32)
+    props = np.zeros((n, len(PROP_COLUMNS)), dtype=np.int32)
+    count_aa(buf, offsets, AA_LUT, AA_GROUP, counts, props)
+    return counts, props
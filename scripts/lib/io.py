@@ -3,10 +3,21 @@ Shared I/O functions for MCP scripts.
 
 These are extracted and simplified from repo code to minimize dependencies.
 """
+import mmap
+import os
 from pathlib import Path
-from typing import Union, Any, List
+from typing import Union, Any, List, TYPE_CHECKING
 import json
-import pandas as pd
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Numeric columns of the protein-sol results CSV
+RESULT_FLOAT_COLUMNS = ('percent-sol', 'scaled-sol', 'population-sol', 'pI')
+
+# Files at least this large are memory-mapped by read_fasta instead of read
+MMAP_THRESHOLD = 1 << 20
 
 
 def load_json(file_path: Union[str, Path]) -> dict:
@@ -32,9 +43,36 @@ def write_fasta(sequence: str, identifier: str, output_file: Union[str, Path]) -
         identifier: Sequence identifier
         output_file: Output FASTA file path
     """
-    with open(output_file, 'w') as f:
-        f.write(f">{identifier}\n")
-        f.write(f"{sequence}\n")
+    with open(output_file, 'wb') as f:
+        f.write(f">{identifier}\n{sequence}\n".encode('ascii'))
+
+
+def _scan_fasta(data: Union[bytes, mmap.mmap]) -> List[tuple]:
+    """Split a FASTA blob into (identifier, sequence) tuples with bulk bytes scans."""
+    sequences = []
+    size = len(data)
+
+    # Skip anything before the first header line
+    if data[:1] == b'>':
+        i = 0
+    else:
+        i = data.find(b'\n>') + 1
+        if i == 0:
+            return sequences
+
+    while i < size:
+        nl = data.find(b'\n', i)
+        if nl == -1:
+            nl = size
+        header = data[i + 1:nl].decode().rstrip()
+        j = data.find(b'\n>', nl)
+        if j == -1:
+            j = size
+        seq = data[nl + 1:j].translate(None, b' \t\r\n\v\f').decode()
+        sequences.append((header, seq))
+        i = j + 1
+
+    return sequences
 
 
 def read_fasta(file_path: Union[str, Path]) -> List[tuple]:
@@ -47,49 +85,100 @@ def read_fasta(file_path: Union[str, Path]) -> List[tuple]:
     Returns:
         List of (identifier, sequence) tuples
     """
-    sequences = []
-    current_id = None
-    current_seq = ""
+    # Large inputs are scanned straight from a read-only mapping of the file
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return _scan_fasta(f.read())
+
+        with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+            return _scan_fasta(mm)
+
+
+def read_prediction_rows(prediction_file: Union[str, Path]) -> List[tuple]:
+    """
+    Read the per-sequence predictions from a pipeline seq_prediction.txt.
 
-    with open(file_path, 'r') as f:
+    Args:
+        prediction_file: Path to seq_prediction.txt
+
+    Returns:
+        List of (ID, percent-sol, scaled-sol, population-sol, pI) text tuples
+    """
+    rows = []
+    with open(prediction_file) as f:
         for line in f:
-            line = line.strip()
-            if line.startswith('>'):
-                if current_id is not None:
-                    sequences.append((current_id, current_seq))
-                current_id = line[1:]  # Remove '>'
-                current_seq = ""
-            else:
-                current_seq += line
-
-    if current_id is not None:
-        sequences.append((current_id, current_seq))
+            # SEQUENCE PREDICTIONS,>ID,percent,scaled,population,pI
+            if line.startswith("SEQUENCE PREDICTIONS,"):
+                fields = line.rstrip('\r\n').split(',')
+                if len(fields) >= 6:
+                    # The ID itself may contain commas; the scores never do
+                    seq_id = ','.join(fields[1:-4]).lstrip('>')
+                    rows.append((seq_id, *(value.strip() for value in fields[-4:])))
+    return rows
 
-    return sequences
+
+def read_results_table(csv_file: Union[str, Path]) -> "pa.Table":
+    """
+    Parse the CSV results file into a pyarrow Table with a fixed schema.
+
+    Args:
+        csv_file: Path to CSV results file
+
+    Returns:
+        Results table (ID and sequence as strings, scores as float64)
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    column_types = {'ID': pa.string(), 'sequence': pa.string()}
+    column_types.update({col: pa.float64() for col in RESULT_FLOAT_COLUMNS})
+    try:
+        return pa_csv.read_csv(
+            csv_file,
+            convert_options=pa_csv.ConvertOptions(column_types=column_types)
+        )
+    except Exception as e:
+        raise ValueError(f"Error parsing CSV file: {e}")
 
 
-def parse_results_csv(csv_file: Union[str, Path]) -> pd.DataFrame:
+def parse_results_csv(csv_file: Union[str, Path]) -> "pd.DataFrame":
     """
     Parse the CSV results file and return a pandas DataFrame.
 
+    Uses pyarrow's CSV reader when it is installed, pandas otherwise; the
+    columns have NumPy dtypes either way (float64 scores).
+
     Args:
         csv_file: Path to CSV results file
 
     Returns:
         Parsed results DataFrame
     """
+    # Imported here so scripts that only need FASTA helpers skip the pandas import
+    import pandas as pd
+
     try:
-        return pd.read_csv(csv_file)
-    except Exception as e:
-        raise ValueError(f"Error parsing CSV file: {e}")
+        import pyarrow  # noqa: F401
+    except ImportError:
+        try:
+            return pd.read_csv(
+                csv_file,
+                dtype={'ID': str, 'sequence': str, **{col: 'float64' for col in RESULT_FLOAT_COLUMNS}}
+            )
+        except Exception as e:
+            raise ValueError(f"Error parsing CSV file: {e}")
+
+    return read_results_table(csv_file).to_pandas()
 
 
-def find_fasta_files(input_path: Union[str, Path]) -> List[str]:
+def find_fasta_files(input_path: Union[str, Path], recursive: bool = True) -> List[str]:
     """
     Find all FASTA files in a directory or return single file.
 
     Args:
         input_path: Path to file or directory
+        recursive: Also search subdirectories
 
     Returns:
         List of FASTA file paths
@@ -99,14 +188,21 @@ def find_fasta_files(input_path: Union[str, Path]) -> List[str]:
     if path.is_file():
         return [str(path)]
     elif path.is_dir():
-        fasta_files = []
         # Common FASTA extensions
-        extensions = ['*.fasta', '*.fa', '*.fas', '*.faa', '*.seq']
+        extensions = {'.fasta', '.fa', '.fas', '.faa', '.seq'}
 
-        for ext in extensions:
-            fasta_files.extend(path.glob(ext))
-            fasta_files.extend(path.glob(f"**/{ext}"))  # Recursive
+        if not recursive:
+            with os.scandir(path) as entries:
+                return [entry.path for entry in entries
+                        if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions]
+
+        # Single walk over the tree, matching on suffix
+        fasta_files = []
+        for root, _, files in os.walk(path):
+            for name in files:
+                if os.path.splitext(name)[1].lower() in extensions:
+                    fasta_files.append(os.path.join(root, name))
 
-        return [str(f) for f in fasta_files]
+        return fasta_files
     else:
-        return []
\ No newline at end of file
+        return []
@@ -4,38 +4,291 @@ Protein solubility prediction utilities.
 Core functions for running the protein-sol Perl pipeline with minimal dependencies.
 """
 import os
+import csv
+import json
 import subprocess
 import tempfile
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
-from typing import Optional, Dict, Union
-
-
+from typing import Optional, Dict, List, Tuple, Union
+
+from .io import read_fasta, read_prediction_rows
+
+# Support files each pipeline entry point stages into its working directory
+PREDICTION_FILES = (
+    "multiple_prediction_wrapper_export.sh",
+    "fasta_seq_reformat_export.pl",
+    "seq_compositions_perc_pipeline_export.pl",
+    "server_prediction_seq_export.pl",
+    "seq_props_ALL_export.pl",
+    "profiles_gather_export.pl",
+    "ss_propensities.txt",
+    "seq_reference_data.txt"
+)
+
+COMPOSITION_FILES = (
+    "seq_compositions_perc_pipeline_export.pl",
+    "seq_props_ALL_export.pl",
+    "seq_reference_data.txt"
+)
+
+# Files the wrapper leaves in its working directory -> (output_files key,
+# suffix appended to output_prefix); the results CSV is built from
+# seq_prediction.txt by _write_results_csv
+OUTPUT_MAP = (
+    ("seq_prediction.txt", "prediction", "_detailed_prediction.txt"),
+    ("seq_composition.txt", "composition", "_composition.txt"),
+    ("run.log", "log", "_prediction.log")
+)
+RESULTS_CSV_SUFFIX = "_solubility_results.csv"
+RESULTS_CSV_HEADER = ('ID', 'sequence', 'percent-sol', 'scaled-sol', 'population-sol', 'pI')
+
+
+@lru_cache(maxsize=1)
 def get_repo_path() -> Path:
-    """Get the path to the protein-sol repository."""
+    """
+    Get the path to the protein-sol repository (resolved once per process).
+
+    A checkout in repo/protein-sol is preferred; otherwise the copy of the
+    pipeline bundled in scripts/protein-sol is used.
+    """
     script_dir = Path(__file__).parent.parent.parent
     repo_dir = script_dir / "repo" / "protein-sol"
 
     if not repo_dir.exists():
-        raise FileNotFoundError(f"Protein-sol repository not found at {repo_dir}")
+        bundled_dir = script_dir / "scripts" / "protein-sol"
+        if not bundled_dir.exists():
+            raise FileNotFoundError(f"Protein-sol repository not found at {repo_dir}")
+        repo_dir = bundled_dir
 
     return repo_dir
 
 
+@lru_cache(maxsize=None)
+def _required_files(names: Tuple[str, ...]) -> List[Tuple[str, Path]]:
+    """Resolve the support files that exist in the repository, once per process."""
+    repo_dir = get_repo_path()
+    return [(name, src) for name in names if (src := repo_dir / name).exists()]
+
+
+def pick_tmp_root() -> Optional[str]:
+    """
+    Directory for pipeline working dirs: PROTEIN_SOL_TMPDIR if set, else
+    /dev/shm when it has room, else None (the system default).
+
+    The Perl steps do many small reads and writes of intermediate files,
+    which a RAM-backed tmpfs serves without touching disk.
+    """
+    override = os.environ.get("PROTEIN_SOL_TMPDIR")
+    if override:
+        return override
+    try:
+        if shutil.disk_usage("/dev/shm").free > 512 << 20:
+            return "/dev/shm"
+    except OSError:
+        pass
+    return None
+
+
+def _stage(src: Path, dst: Path) -> None:
+    """Place a read-only support file in a working directory without copying data."""
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    if os.name != 'nt':
+        try:
+            os.symlink(src.resolve(), dst)
+            return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
+
+def _fast_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Copy a file, letting the kernel move the bytes where possible.
+
+    Tries copy_file_range (reflink/server-side copy), then sendfile, then a
+    buffered userspace copy; metadata is copied as with shutil.copy2.
+    """
+    src, dst = str(src), str(dst)
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+
+        try:
+            offset = 0
+            while offset < size:
+                n = os.copy_file_range(in_fd, out_fd, size - offset, offset, offset)
+                if n == 0:
+                    break
+                offset += n
+            copied = True
+        except (AttributeError, OSError):
+            copied = False
+
+        if not copied:
+            fdst.seek(0)
+            fdst.truncate()
+            try:
+                offset = 0
+                while offset < size:
+                    n = os.sendfile(out_fd, in_fd, offset, min(size - offset, 1 << 30))
+                    if n == 0:
+                        break
+                    offset += n
+                copied = True
+            except (AttributeError, OSError):
+                fdst.seek(0)
+                fdst.truncate()
+
+        if not copied:
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+
+    shutil.copystat(src, dst)
+
+
+def _cache_root() -> Path:
+    """Root of the on-disk result cache (override with PROTEIN_SOL_CACHE)."""
+    return Path(os.environ.get("PROTEIN_SOL_CACHE", Path.home() / ".cache" / "protein_sol"))
+
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, mtime_ns: int, size: int) -> bytes:
+    """Content hash of a support file; the stat fields key the memo, so edits are picked up."""
+    h = blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.digest()
+
+
+def _cache_key(
+    input_fasta: Union[str, Path],
+    repo_dir: Path,
+    pinned: Tuple[str, ...] = PREDICTION_FILES
+) -> str:
+    """Hash the input FASTA contents together with the pipeline version."""
+    h = blake2b(digest_size=16)
+    with open(input_fasta, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+
+    # The pipeline version is the contents of every script and data file it
+    # uses, so any edit to one of them invalidates previous results
+    for name in pinned:
+        h.update(name.encode())
+        try:
+            st = (repo_dir / name).stat()
+        except FileNotFoundError:
+            h.update(b"missing")
+            continue
+        h.update(_file_digest(str(repo_dir / name), st.st_mtime_ns, st.st_size))
+    return h.hexdigest()
+
+
+def invalidate_cache(namespace: Optional[str] = None) -> None:
+    """
+    Drop cached results.
+
+    Args:
+        namespace: "prediction" or "composition"; None clears both
+    """
+    namespaces = [namespace] if namespace else ["prediction", "composition"]
+    for name in namespaces:
+        shutil.rmtree(_cache_root() / name, ignore_errors=True)
+
+
+def _load_cached_outputs(namespace: str, key: str, output_prefix: str) -> Optional[Dict[str, str]]:
+    """Copy cached outputs to their final names, or return None on a cache miss."""
+    entry = _cache_root() / namespace / key
+    try:
+        with open(entry / "MANIFEST.json") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    output_files = {}
+    try:
+        for name, suffix in manifest.items():
+            final = f"{output_prefix}{suffix}"
+            _fast_copy(entry / suffix.lstrip('_'), final)
+            output_files[name] = final
+    except OSError:
+        # A damaged entry is dropped so the next run can store a fresh one
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    return output_files
+
+
+def _store_cached_outputs(namespace: str, key: str, output_prefix: str, output_files: Dict[str, str]) -> None:
+    """Publish outputs under the cache key; concurrent writers race harmlessly."""
+    entry = _cache_root() / namespace / key
+    tmp = entry.with_name(f"{key}.tmp{os.getpid()}")
+    try:
+        tmp.mkdir(parents=True)
+        manifest = {}
+        for name, path in output_files.items():
+            suffix = path[len(output_prefix):]
+            _fast_copy(path, tmp / suffix.lstrip('_'))
+            manifest[name] = suffix
+        with open(tmp / "MANIFEST.json", 'w') as f:
+            json.dump(manifest, f)
+        os.rename(tmp, entry)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _write_results_csv(working_dir: Union[str, Path], output_csv: str) -> int:
+    """
+    Write the results CSV (RESULTS_CSV_HEADER columns) for a finished wrapper run.
+
+    Sequences come from the reformatted input.fasta, which the pipeline keys
+    by the first token of each header.
+
+    Returns:
+        Number of predictions written
+    """
+    wd = Path(working_dir)
+    sequences = {}
+    for header, seq in read_fasta(wd / "input.fasta"):
+        sequences.setdefault((header.split() or [''])[0], seq)
+
+    rows = read_prediction_rows(wd / "seq_prediction.txt")
+    with open(output_csv, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULTS_CSV_HEADER)
+        writer.writerows((seq_id, sequences.get(seq_id, ''), *scores) for seq_id, *scores in rows)
+    return len(rows)
+
+
 def run_protein_sol_prediction(
     input_fasta: Union[str, Path],
     output_prefix: Optional[str] = None,
     working_dir: Optional[str] = None,
-    cleanup: bool = True
+    cleanup: bool = True,
+    use_cache: bool = False
 ) -> Dict[str, str]:
     """
     Run protein solubility prediction using the Perl pipeline.
 
+    With use_cache, results are cached on disk keyed by the FASTA contents,
+    so repeated inputs are served without running Perl.
+
     Args:
         input_fasta: Path to input FASTA file
         output_prefix: Optional output prefix. If None, uses input filename
         working_dir: Optional working directory. If None, uses temp directory
         cleanup: Whether to cleanup temporary files
+        use_cache: Reuse and store results in the on-disk cache
+            (default: False)
 
     Returns:
         Dictionary containing paths to output files
@@ -45,9 +298,15 @@ def run_protein_sol_prediction(
 
     repo_dir = get_repo_path()
 
+    cache_key = _cache_key(input_fasta, repo_dir) if use_cache else None
+    if cache_key:
+        cached = _load_cached_outputs("prediction", cache_key, output_prefix)
+        if cached is not None:
+            return cached
+
     # Create working directory if needed
     if working_dir is None:
-        working_dir = tempfile.mkdtemp(prefix="protein_sol_")
+        working_dir = tempfile.mkdtemp(prefix="protein_sol_", dir=pick_tmp_root())
         temp_dir = True
     else:
         Path(working_dir).mkdir(parents=True, exist_ok=True)
@@ -55,68 +314,36 @@ def run_protein_sol_prediction(
 
     try:
         # Copy required files to working directory
-        required_files = [
-            "multiple_prediction_wrapper_export.sh",
-            "fasta_seq_reformat_export.pl",
-            "seq_compositions_perc_pipeline_export.pl",
-            "server_prediction_seq_export.pl",
-            "seq_props_ALL_export.pl",
-            "profiles_gather_export.pl",
-            "ss_propensities.txt",
-            "seq_reference_data.txt"
-        ]
-
-        for file in required_files:
-            src = repo_dir / file
-            dst = Path(working_dir) / file
-            if src.exists():
-                shutil.copy2(src, dst)
-
-        # Copy input file to working directory
+        for name, src in _required_files(PREDICTION_FILES):
+            _stage(src, Path(working_dir) / name)
+
+        # Copy input file to working directory (the pipeline rewrites it in place)
         input_file = Path(working_dir) / "input.fasta"
         shutil.copy2(input_fasta, input_file)
 
-        # Make wrapper script executable
-        wrapper_script = Path(working_dir) / "multiple_prediction_wrapper_export.sh"
-        wrapper_script.chmod(0o755)
-
-        # Run prediction
+        # Run prediction; the wrapper logs to run.log itself, so only stderr
+        # is needed, on failure
         cmd = ["bash", "multiple_prediction_wrapper_export.sh", "input.fasta"]
-        result = subprocess.run(cmd, cwd=working_dir, capture_output=True, text=True)
+        result = subprocess.run(cmd, cwd=working_dir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
         if result.returncode != 0:
-            raise RuntimeError(f"Prediction failed: {result.stderr}")
+            raise RuntimeError(f"Prediction failed: {result.stderr.decode(errors='replace')}")
 
-        # Collect output files
+        # Copy results to final location with custom prefix, in one directory pass
+        present = {entry.name: entry.path for entry in os.scandir(working_dir)}
         output_files = {}
-        base_name = "input.fasta"
-
-        # Main prediction results
-        csv_file = Path(working_dir) / f"{base_name}-protein_sol.csv"
-        prediction_file = Path(working_dir) / f"{base_name}-protein_sol_prediction.txt"
-        composition_file = Path(working_dir) / f"{base_name}-protein_sol_composition.txt"
-        log_file = Path(working_dir) / f"{base_name}-protein_sol.log"
-
-        # Copy results to final location with custom prefix
-        if csv_file.exists():
-            final_csv = f"{output_prefix}_solubility_results.csv"
-            shutil.copy2(csv_file, final_csv)
+        if "seq_prediction.txt" in present:
+            final_csv = f"{output_prefix}{RESULTS_CSV_SUFFIX}"
+            _write_results_csv(working_dir, final_csv)
             output_files['csv'] = final_csv
+        for src_name, key, suffix in OUTPUT_MAP:
+            if src_name in present:
+                final = f"{output_prefix}{suffix}"
+                _fast_copy(present[src_name], final)
+                output_files[key] = final
 
-        if prediction_file.exists():
-            final_prediction = f"{output_prefix}_detailed_prediction.txt"
-            shutil.copy2(prediction_file, final_prediction)
-            output_files['prediction'] = final_prediction
-
-        if composition_file.exists():
-            final_composition = f"{output_prefix}_composition.txt"
-            shutil.copy2(composition_file, final_composition)
-            output_files['composition'] = final_composition
-
-        if log_file.exists():
-            final_log = f"{output_prefix}_prediction.log"
-            shutil.copy2(log_file, final_log)
-            output_files['log'] = final_log
+        if cache_key and output_files:
+            _store_cached_outputs("prediction", cache_key, output_prefix, output_files)
 
         return output_files
 
@@ -126,16 +353,223 @@ def run_protein_sol_prediction(
             shutil.rmtree(working_dir)
 
 
+def _split_shard_text(lines: List[bytes]) -> Tuple[List[bytes], List[bytes], List[bytes]]:
+    """
+    Split a pipeline text output into (header, records, trailer) lines.
+
+    Record lines carry a ",>ID" field; the header is everything before the
+    first of them (LEGEND/HEADERS or column-name lines) and the trailer
+    starts at the first non-blank line after the last (the composition
+    SUMS lines). Files without records are all trailer.
+    """
+    records = [i for i, line in enumerate(lines) if b',>' in line]
+    if not records:
+        return [], [], lines
+    end = records[-1] + 1
+    while end < len(lines) and not lines[end].strip():
+        end += 1
+    return lines[:records[0]], lines[records[0]:end], lines[end:]
+
+
+def _merge_shard_text(parts: List[str], final: str) -> None:
+    """
+    Merge per-shard text outputs, in order, into one file.
+
+    The header is written once, from the first shard, followed by every
+    shard's records and then every shard's trailer, so the result reads
+    like the output of a single run. Composition SUMS lines cover only
+    their own shard's sequences.
+    """
+    header, records, trailers = None, [], []
+    for part in parts:
+        with open(part, 'rb') as f:
+            part_header, part_records, part_trailer = _split_shard_text(f.readlines())
+        if header is None:
+            header = part_header
+        records.extend(part_records)
+        # A blank line between shards' SUMS lines, as between those of one run
+        if part_records and part_trailer and trailers and part_trailer[0].strip():
+            trailers.append(b'\n')
+        trailers.extend(part_trailer)
+
+    with open(final, 'wb') as dst:
+        dst.writelines(header)
+        dst.writelines(records)
+        dst.writelines(trailers)
+
+
+def run_protein_sol_prediction_parallel(
+    input_fasta: Union[str, Path],
+    output_prefix: Optional[str] = None,
+    n_workers: Optional[int] = None,
+    cleanup: bool = True,
+    use_cache: bool = False
+) -> Dict[str, str]:
+    """
+    Run the Perl pipeline on shards of a multi-sequence FASTA in parallel.
+
+    The input is split into contiguous shards (so result order is preserved),
+    each shard runs in its own working directory and process, and the
+    per-shard outputs are merged (see _merge_shard_text).
+
+    Args:
+        input_fasta: Path to input FASTA file
+        output_prefix: Optional output prefix. If None, uses input filename
+        n_workers: Number of shards/processes (default: CPU count)
+        cleanup: Whether to cleanup temporary files
+        use_cache: Reuse and store per-shard results in the on-disk cache
+            (default: False)
+
+    Returns:
+        Dictionary containing paths to output files
+    """
+    import pandas as pd
+
+    if output_prefix is None:
+        output_prefix = Path(input_fasta).stem
+
+    sequences = read_fasta(input_fasta)
+    n_workers = min(len(sequences), n_workers or os.cpu_count() or 1)
+    if n_workers <= 1:
+        return run_protein_sol_prediction(input_fasta, output_prefix, cleanup=cleanup, use_cache=use_cache)
+
+    shard_dir = tempfile.mkdtemp(prefix="protein_sol_shards_", dir=pick_tmp_root())
+    try:
+        shard_files = []
+        bounds = [len(sequences) * i // n_workers for i in range(n_workers + 1)]
+        for i in range(n_workers):
+            shard = Path(shard_dir) / f"shard{i}.fasta"
+            shard.write_text(''.join(f">{seq_id}\n{seq}\n" for seq_id, seq in sequences[bounds[i]:bounds[i + 1]]))
+            shard_files.append(shard)
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(run_protein_sol_prediction, shard, f"{shard_dir}/s{i}",
+                                cleanup=cleanup, use_cache=use_cache)
+                for i, shard in enumerate(shard_files)
+            ]
+            shard_outputs = [future.result() for future in futures]
+
+        # Merge shard outputs in input order
+        csv_files = [out['csv'] for out in shard_outputs if 'csv' in out]
+        merged = pd.concat([pd.read_csv(f, dtype=str, keep_default_na=False) for f in csv_files]) if csv_files else None
+        if merged is None or merged.empty:
+            raise RuntimeError("Parallel prediction produced no results in any shard")
+
+        final_csv = f"{output_prefix}{RESULTS_CSV_SUFFIX}"
+        merged.to_csv(final_csv, index=False, lineterminator='\r\n')
+        output_files = {'csv': final_csv}
+
+        for _, name, suffix in OUTPUT_MAP:
+            parts = [out[name] for out in shard_outputs if name in out]
+            if parts:
+                final = f"{output_prefix}{suffix}"
+                _merge_shard_text(parts, final)
+                output_files[name] = final
+
+        return output_files
+
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+def run_protein_sol_prediction_many(
+    inputs: List[Union[str, Path]],
+    output_prefixes: List[str],
+    working_dir: Optional[str] = None,
+    cleanup: bool = True,
+    n_workers: int = 1,
+    use_cache: bool = False
+) -> List[Dict[str, str]]:
+    """
+    Predict several FASTA files with a single run of the Perl pipeline.
+
+    Headers are tagged with their input index before the files are
+    concatenated, and the combined CSV is split back per input afterwards.
+
+    Args:
+        inputs: Paths to input FASTA files
+        output_prefixes: Output prefix for each input
+        working_dir: Optional working directory. If None, uses temp directory
+            (ignored when n_workers > 1, as every shard gets its own)
+        cleanup: Whether to cleanup temporary files
+        n_workers: Shard the combined input across this many processes
+            (see run_protein_sol_prediction_parallel); 1 runs it in one go
+        use_cache: Reuse and store results for the combined input in the
+            on-disk cache (default: False)
+
+    Returns:
+        List of output file dictionaries, one per input
+    """
+    import pandas as pd
+
+    if len(inputs) != len(output_prefixes):
+        raise ValueError("inputs and output_prefixes must have the same length")
+
+    batch_dir = tempfile.mkdtemp(prefix="protein_sol_many_")
+    try:
+        combined = Path(batch_dir) / "combined.fasta"
+        with open(combined, 'wb') as out:
+            for i, path in enumerate(inputs):
+                data = b'\n' + Path(path).read_bytes()
+                out.write(data.replace(b'\n>', f'\n>orig{i}__'.encode())[1:])
+                if not data.endswith(b'\n'):
+                    out.write(b'\n')
+
+        if n_workers > 1:
+            batch_files = run_protein_sol_prediction_parallel(
+                input_fasta=combined,
+                output_prefix=str(Path(batch_dir) / "batch"),
+                n_workers=n_workers,
+                cleanup=cleanup,
+                use_cache=use_cache
+            )
+        else:
+            batch_files = run_protein_sol_prediction(
+                input_fasta=combined,
+                output_prefix=str(Path(batch_dir) / "batch"),
+                working_dir=working_dir,
+                cleanup=cleanup,
+                use_cache=use_cache
+            )
+        if 'csv' not in batch_files:
+            raise RuntimeError("Batched prediction produced no CSV results")
+
+        # Route every row back to the input it came from (as text, so the
+        # scores are written back exactly as the pipeline printed them)
+        df = pd.read_csv(batch_files['csv'], dtype=str, keep_default_na=False)
+        tags = df['ID'].str.extract(r'^orig(\d+)__', expand=False)
+        df['ID'] = df['ID'].str.replace(r'^orig\d+__', '', regex=True)
+        groups = {int(tag): group for tag, group in df.groupby(tags)}
+
+        results = []
+        for i, prefix in enumerate(output_prefixes):
+            final_csv = f"{prefix}_solubility_results.csv"
+            groups.get(i, df.iloc[:0]).to_csv(final_csv, index=False)
+            results.append({'csv': final_csv})
+        return results
+
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+
 def run_composition_analysis(
     input_fasta: Union[str, Path],
-    output_prefix: Optional[str] = None
+    output_prefix: Optional[str] = None,
+    use_cache: bool = False
 ) -> Dict[str, str]:
     """
     Analyze sequence composition and properties.
 
+    With use_cache, results are cached on disk keyed by the FASTA contents
+    and the versions of the scripts and reference data used (see
+    invalidate_cache).
+
     Args:
         input_fasta: Path to input FASTA file
         output_prefix: Output prefix for files
+        use_cache: Reuse and store results in the on-disk cache
+            (default: False)
 
     Returns:
         Dictionary with analysis results and output files
@@ -143,40 +577,44 @@ def run_composition_analysis(
     if output_prefix is None:
         output_prefix = Path(input_fasta).stem
 
-    repo_dir = get_repo_path()
+    # Resolve support files before creating the working directory
+    support_files = _required_files(COMPOSITION_FILES)
+
+    cache_key = _cache_key(input_fasta, get_repo_path(), COMPOSITION_FILES) if use_cache else None
+    if cache_key:
+        cached = _load_cached_outputs("composition", cache_key, output_prefix)
+        if cached is not None:
+            return cached
 
     # Use temporary directory for processing
-    with tempfile.TemporaryDirectory(prefix="protein_comp_") as working_dir:
+    with tempfile.TemporaryDirectory(prefix="protein_comp_", dir=pick_tmp_root()) as working_dir:
         # Copy required files
-        required_files = [
-            "seq_compositions_perc_pipeline_export.pl",
-            "seq_props_ALL_export.pl",
-            "seq_reference_data.txt"
-        ]
-
-        for file in required_files:
-            src = repo_dir / file
-            dst = Path(working_dir) / file
-            if src.exists():
-                shutil.copy2(src, dst)
+        for name, src in support_files:
+            _stage(src, Path(working_dir) / name)
 
         # Copy input file
         input_file = Path(working_dir) / "input.fasta"
         shutil.copy2(input_fasta, input_file)
 
-        # Run composition analysis
-        cmd = ["perl", "seq_compositions_perc_pipeline_export.pl", "input.fasta"]
-        result = subprocess.run(cmd, cwd=working_dir, capture_output=True, text=True)
+        # Stdout is never used; stderr is only read back if a step fails
+        with tempfile.TemporaryFile() as err:
+            # Run composition analysis
+            cmd = ["perl", "seq_compositions_perc_pipeline_export.pl", "input.fasta"]
+            result = subprocess.run(cmd, cwd=working_dir, stdout=subprocess.DEVNULL, stderr=err)
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Composition analysis failed: {result.stderr}")
+            if result.returncode != 0:
+                err.seek(0)
+                raise RuntimeError(f"Composition analysis failed: {err.read().decode(errors='replace')}")
 
-        # Run properties analysis
-        cmd = ["perl", "seq_props_ALL_export.pl", "input.fasta"]
-        result = subprocess.run(cmd, cwd=working_dir, capture_output=True, text=True)
+            # Run properties analysis (dropping any warnings from the first step)
+            err.seek(0)
+            err.truncate()
+            cmd = ["perl", "seq_props_ALL_export.pl", "input.fasta"]
+            result = subprocess.run(cmd, cwd=working_dir, stdout=subprocess.DEVNULL, stderr=err)
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Properties analysis failed: {result.stderr}")
+            if result.returncode != 0:
+                err.seek(0)
+                raise RuntimeError(f"Properties analysis failed: {err.read().decode(errors='replace')}")
 
         # Collect outputs
         output_files = {}
@@ -186,12 +624,15 @@ def run_composition_analysis(
 
         if composition_file.exists():
             final_comp = f"{output_prefix}_composition_analysis.txt"
-            shutil.copy2(composition_file, final_comp)
+            _fast_copy(composition_file, final_comp)
             output_files['composition'] = final_comp
 
         if properties_file.exists():
             final_props = f"{output_prefix}_properties_analysis.txt"
-            shutil.copy2(properties_file, final_props)
+            _fast_copy(properties_file, final_props)
             output_files['properties'] = final_props
 
+        if cache_key and output_files:
+            _store_cached_outputs("composition", cache_key, output_prefix, output_files)
+
         return output_files
\ No newline at end of file
@@ -8,6 +8,7 @@ Dependencies Removed: Inlined utility functions, simplified error handling
 
 Usage:
     python scripts/predict_solubility.py --input <input_file> --output <output_file>
+    python scripts/predict_solubility.py --inputs <file1> <file2> ... --output <output_dir>
 
 Example:
     python scripts/predict_solubility.py --input examples/data/example.fasta --output results/prediction
@@ -19,7 +20,7 @@ Example:
 import argparse
 import sys
 from pathlib import Path
-from typing import Union, Optional, Dict, Any
+from typing import Union, Optional, Dict, Any, List
 import json
 
 # Essential scientific package
@@ -27,7 +28,11 @@ import pandas as pd
 
 # Local imports (shared library)
 from lib.io import parse_results_csv
-from lib.protein_sol import run_protein_sol_prediction
+from lib.protein_sol import (
+    run_protein_sol_prediction,
+    run_protein_sol_prediction_many,
+    run_protein_sol_prediction_parallel
+)
 
 # ==============================================================================
 # Configuration (extracted from use case)
@@ -36,7 +41,9 @@ DEFAULT_CONFIG = {
     "show_results": False,
     "cleanup_temp": True,
     "output_format": "csv",
-    "include_detailed": True
+    "include_detailed": True,
+    "use_cache": False,
+    "workers": 1
 }
 
 # ==============================================================================
@@ -80,12 +87,22 @@ def run_predict_solubility(
     else:
         output_prefix = input_file.stem
 
-    # Run prediction using shared library
-    output_files = run_protein_sol_prediction(
-        input_fasta=input_file,
-        output_prefix=output_prefix,
-        cleanup=config['cleanup_temp']
-    )
+    # Run prediction using shared library, sharding across processes if requested
+    if config['workers'] > 1:
+        output_files = run_protein_sol_prediction_parallel(
+            input_fasta=input_file,
+            output_prefix=output_prefix,
+            n_workers=config['workers'],
+            cleanup=config['cleanup_temp'],
+            use_cache=config['use_cache']
+        )
+    else:
+        output_files = run_protein_sol_prediction(
+            input_fasta=input_file,
+            output_prefix=output_prefix,
+            cleanup=config['cleanup_temp'],
+            use_cache=config['use_cache']
+        )
 
     # Parse main results
     result_df = None
@@ -103,6 +120,61 @@ def run_predict_solubility(
     }
 
 
+def run_predict_solubility_many(
+    input_files: List[Union[str, Path]],
+    output_dir: Optional[Union[str, Path]] = None,
+    config: Optional[Dict[str, Any]] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Predict solubility for several FASTA files with one pipeline run.
+
+    Perl start-up is paid once for the whole set instead of once per file.
+
+    Args:
+        input_files: Paths to input FASTA files
+        output_dir: Directory for per-file outputs (default: current directory)
+        config: Configuration dict (uses DEFAULT_CONFIG if not provided)
+        **kwargs: Override specific config parameters
+
+    Returns:
+        Dict containing:
+            - results: Per-file dicts with input_file and output_files
+            - metadata: Execution metadata
+    """
+    # Setup
+    input_files = [Path(f) for f in input_files]
+    config = {**DEFAULT_CONFIG, **(config or {}), **kwargs}
+
+    for input_file in input_files:
+        if not input_file.exists():
+            raise FileNotFoundError(f"Input file not found: {input_file}")
+
+    output_root = Path(output_dir) if output_dir else Path('.')
+    output_root.mkdir(parents=True, exist_ok=True)
+    output_prefixes = [str(output_root / f.stem) for f in input_files]
+
+    all_output_files = run_protein_sol_prediction_many(
+        inputs=input_files,
+        output_prefixes=output_prefixes,
+        cleanup=config['cleanup_temp'],
+        n_workers=config['workers'],
+        use_cache=config['use_cache']
+    )
+
+    return {
+        "results": [
+            {"input_file": str(f), "output_files": files}
+            for f, files in zip(input_files, all_output_files)
+        ],
+        "metadata": {
+            "input_files": [str(f) for f in input_files],
+            "config": config,
+            "success": True
+        }
+    }
+
+
 # ==============================================================================
 # CLI Interface
 # ==============================================================================
@@ -126,14 +198,23 @@ The CSV file contains:
   - pI: Isoelectric point
         """
     )
-    parser.add_argument('--input', '-i', required=True,
-                       help='Input FASTA file containing protein sequences')
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument('--input', '-i',
+                           help='Input FASTA file containing protein sequences')
+    input_group.add_argument('--inputs', nargs='+',
+                           help='Several FASTA files to predict in a single pipeline run')
     parser.add_argument('--output', '-o',
-                       help='Output prefix for result files (default: input filename)')
+                       help='Output prefix for result files (default: input filename); '
+                            'output directory with --inputs')
     parser.add_argument('--config', '-c',
                        help='Config file (JSON)')
     parser.add_argument('--show-results', action='store_true',
                        help='Display results summary after prediction')
+    parser.add_argument('--workers', '-w', type=int,
+                       help='Split the input into this many shards and predict them in parallel')
+    parser.add_argument('--cache', action='store_true',
+                       help='Reuse and store results in the on-disk cache '
+                            '(~/.cache/protein_sol, or $PROTEIN_SOL_CACHE)')
 
     args = parser.parse_args()
 
@@ -147,9 +228,28 @@ The CSV file contains:
     cli_overrides = {}
     if args.show_results:
         cli_overrides['show_results'] = True
+    if args.cache:
+        cli_overrides['use_cache'] = True
+    if args.workers:
+        cli_overrides['workers'] = args.workers
 
     # Run
     try:
+        if args.inputs:
+            result = run_predict_solubility_many(
+                input_files=args.inputs,
+                output_dir=args.output,
+                config=config,
+                **cli_overrides
+            )
+
+            print(f"✅ Prediction completed successfully for {len(result['results'])} files!")
+            for entry in result['results']:
+                print(f"{entry['input_file']}:")
+                for file_type, path in entry['output_files'].items():
+                    print(f"  {file_type}: {path}")
+            return result
+
         result = run_predict_solubility(
             input_file=args.input,
             output_file=args.output,
@@ -169,12 +269,17 @@ The CSV file contains:
 
         # Save JSON output if --output specified with .json extension (for MCP job manager)
         if args.output and str(args.output).endswith('.json'):
-            # Convert DataFrame to dict for JSON serialization
-            json_result = result.copy()
-            if json_result['result'] is not None:
-                json_result['result'] = json_result['result'].to_dict('records')
             with open(args.output, 'w') as f:
-                json.dump(json_result, f, indent=2, default=str)
+                if result['result'] is None:
+                    json.dump(result, f, indent=2, default=str)
+                else:
+                    # Stream the rows straight from pandas' C JSON writer
+                    f.write('{\n  "result": ')
+                    result['result'].to_json(f, orient='records')
+                    for key in ('output_files', 'metadata'):
+                        f.write(f',\n  "{key}": ')
+                        f.write(json.dumps(result[key], indent=2, default=str).replace('\n', '\n  '))
+                    f.write('\n}\n')
 
         return result
 
@@ -6,11 +6,18 @@ Replicates the functionality of multiple_prediction_wrapper_export.sh
 
 import argparse
 import csv
+import os
 import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
+import pandas as pd
+
+
+PREDICTION_COLUMNS = ['percent-sol', 'scaled-sol', 'population-sol', 'pI']
+
 
 def parse_fasta(fasta_file):
     """
@@ -19,28 +26,36 @@ def parse_fasta(fasta_file):
     Returns:
         dict: Dictionary mapping sequence ID to sequence string
     """
-    sequences = {}
-    current_id = None
-    current_seq = []
-
-    with open(fasta_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('>'):
-                # Save previous sequence if exists
-                if current_id is not None:
-                    sequences[current_id] = ''.join(current_seq)
-                # Start new sequence
-                current_id = line[1:]  # Remove '>' character
-                current_seq = []
-            else:
-                current_seq.append(line)
-
-        # Save last sequence
-        if current_id is not None:
-            sequences[current_id] = ''.join(current_seq)
-
-    return sequences
+    lines = pd.Series(Path(fasta_file).read_text().split('\n')).str.strip()
+
+    # Every header opens a record; group sequence lines by record number
+    is_header = lines.str.startswith('>')
+    record = is_header.cumsum()
+    headers = lines[is_header].str[1:]  # Remove '>' character
+
+    body = ~is_header & (record > 0)
+    seqs = lines[body].groupby(record[body]).agg(''.join)
+    seqs = seqs.reindex(record[is_header], fill_value='')
+
+    return dict(zip(headers, seqs))
+
+
+def parse_predictions(prediction_file):
+    """
+    Read the SEQUENCE PREDICTIONS rows of seq_prediction.txt.
+
+    Returns:
+        DataFrame: ID (without '>') plus the four prediction columns as text
+    """
+    raw = pd.read_csv(
+        prediction_file, header=None, names=['tag', 'ID'] + PREDICTION_COLUMNS,
+        dtype=str, quoting=csv.QUOTE_NONE, on_bad_lines='skip', engine='c'
+    )
+    preds = raw[raw['tag'] == 'SEQUENCE PREDICTIONS'].drop(columns='tag')
+    preds = preds.dropna()
+    preds['ID'] = preds['ID'].str.lstrip('>')
+    preds[PREDICTION_COLUMNS] = preds[PREDICTION_COLUMNS].apply(lambda col: col.str.strip())
+    return preds
 
 
 def create_csv_output(fasta_file, prediction_file, output_file):
@@ -51,117 +66,171 @@ def create_csv_output(fasta_file, prediction_file, output_file):
         fasta_file: Path to original FASTA file
         prediction_file: Path to seq_prediction.txt
         output_file: Path to output CSV file
+
+    Returns:
+        DataFrame: The rows written to output_file, or None on failure
     """
     # Parse sequences from FASTA
     sequences = parse_fasta(fasta_file)
 
     # Parse predictions
-    predictions = {}
     try:
-        with open(prediction_file, 'r') as f:
-            for line in f:
-                if line.startswith("SEQUENCE PREDICTIONS,"):
-                    parts = line.strip().split(',')
-                    if len(parts) >= 6:
-                        seq_id = parts[1].lstrip('>')  # Remove '>' if present
-                        predictions[seq_id] = {
-                            'percent-sol': parts[2].strip(),
-                            'scaled-sol': parts[3].strip(),
-                            'population-sol': parts[4].strip(),
-                            'pI': parts[5].strip()
-                        }
+        preds = parse_predictions(prediction_file)
     except FileNotFoundError:
         print(f"Error: Prediction file '{prediction_file}' not found", file=sys.stderr)
-        return False
+        return None
 
     # Create CSV output
     try:
-        with open(output_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['ID', 'sequence', 'percent-sol', 'scaled-sol', 'population-sol', 'pI'])
-
-            for seq_id, sequence in sequences.items():
-                # Try exact match first
-                if seq_id in predictions:
-                    pred = predictions[seq_id]
-                else:
-                    # Try matching by the first part before space (for headers with descriptions)
-                    seq_id_base = seq_id.split()[0] if ' ' in seq_id else seq_id
-                    pred = None
-                    for pred_id, pred_data in predictions.items():
-                        if pred_id == seq_id_base or seq_id_base == pred_id.split()[0]:
-                            pred = pred_data
-                            break
-                    if pred is None:
-                        continue
-
-                writer.writerow([
-                    seq_id,
-                    sequence,
-                    pred['percent-sol'],
-                    pred['scaled-sol'],
-                    pred['population-sol'],
-                    pred['pI']
-                ])
+        df = pd.DataFrame({'ID': list(sequences), 'sequence': list(sequences.values())})
+
+        # Exact ID match first, then match on the first token of the header
+        # (the pipeline only keeps the part before the first space)
+        by_id = preds.drop_duplicates('ID', keep='last').set_index('ID')[PREDICTION_COLUMNS]
+        by_token = (preds.assign(token=preds['ID'].str.split().str[0])
+                    .drop_duplicates('token').set_index('token')[PREDICTION_COLUMNS])
+        matched = by_id.reindex(df['ID']).reset_index(drop=True).combine_first(
+            by_token.reindex(df['ID'].str.split().str[0]).reset_index(drop=True))
+
+        df = pd.concat([df, matched], axis=1).dropna(subset=PREDICTION_COLUMNS).reset_index(drop=True)
+        df.to_csv(output_file, index=False, lineterminator='\r\n')
 
         print(f"✓ CSV output saved to {output_file}")
-        return True
+        return df
 
     except Exception as e:
         print(f"Error creating CSV output: {e}", file=sys.stderr)
-        return False
+        return None
 
 
-def run_perl_script(script_name, log_file, verbose=True):
-    """Run a Perl script and append output to log file."""
-    print(f"Running {script_name}...")
+# Pipeline scripts in run order
+PIPELINE_SCRIPTS = [
+    "fasta_seq_reformat_export.pl",
+    "seq_compositions_perc_pipeline_export.pl",
+    "server_prediction_seq_export.pl",
+    "seq_props_ALL_export.pl",
+    "profiles_gather_export.pl",
+]
 
-    try:
-        result = subprocess.run(
-            ["perl", script_name],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        # Write to log file
-        with open(log_file, 'a') as f:
-            f.write(f"\n{'='*60}\n")
-            f.write(f"Script: {script_name}\n")
-            f.write(f"{'='*60}\n")
-            if result.stdout:
-                f.write(result.stdout)
-            if result.stderr:
-                f.write("STDERR:\n")
-                f.write(result.stderr)
-
-        # Print to console if verbose
-        if verbose:
-            if result.stdout:
-                print(result.stdout)
-            if result.stderr:
-                print(f"STDERR: {result.stderr}", file=sys.stderr)
+# Everything the scripts read from their working directory
+SUPPORT_FILES = PIPELINE_SCRIPTS + ["ss_propensities.txt", "seq_reference_data.txt"]
 
-        print(f"✓ {script_name} completed successfully")
-        return True
 
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Error running {script_name}: {e}"
-        print(error_msg, file=sys.stderr)
+def stage_support_files(protein_sol_dir, working):
+    """Link the read-only pipeline files into a working directory (copy as a last resort)."""
+    for name in SUPPORT_FILES:
+        src = protein_sol_dir / name
+        if not src.exists():
+            continue
+        try:
+            os.link(src, working / name)
+        except OSError:
+            try:
+                os.symlink(src, working / name)
+            except OSError:
+                shutil.copy2(src, working / name)
+
+# One perl process drives every step. Each script runs in a forked child so
+# its globals and trailing exit() stay isolated, and the intermediate file
+# shuffling the wrapper script does between steps happens in-process. The
+# driver's stdout is the finished log section for each script, so it can be
+# written straight to the log file.
+PIPELINE_DRIVER = r"""
+use strict;
+use File::Copy qw(copy);
+$| = 1;
+my $in = shift @ARGV;
+my $sep = "=" x 60;
+
+# The step inputs are only ever read, so a hard link stands in for a copy
+sub stage {
+    my ($src, $dst) = @_;
+    unlink $dst;
+    link($src, $dst) or copy($src, $dst) or die "stage $dst: $!\n";
+}
+
+sub step {
+    my ($script) = @_;
+    print "\n$sep\nScript: $script\n$sep\n";
+    my $err = "$script.stderr";
+    my $pid = fork();
+    die "fork failed: $!\n" unless defined $pid;
+    if (!$pid) {
+        open(STDERR, '>', $err) or die "cannot redirect stderr: $!\n";
+        do "./$script";
+        die $@ if $@;
+        exit 0;
+    }
+    waitpid($pid, 0);
+    my $status = $?;
+    if (-s $err && open(my $fh, '<', $err)) {
+        print "STDERR:\n";
+        print while <$fh>;
+        close $fh;
+    }
+    unlink $err;
+    die "$script exited with status " . ($status >> 8) . "\n" if $status;
+}
+
+stage($in, "reformat.in");
+step("fasta_seq_reformat_export.pl");
+rename($in, "${in}_ORIGINAL") or die "backup $in: $!\n";
+rename("reformat_out", $in) or die "move reformat_out: $!\n";
+
+stage($in, "composition.in");
+step("seq_compositions_perc_pipeline_export.pl");
+rename("composition_all.out", "seq_composition.txt") or die "move composition_all.out: $!\n";
+
+step("server_prediction_seq_export.pl");
+
+stage($in, "seq_props.in");
+step("seq_props_ALL_export.pl");
+
+rename("seq_prediction.txt", "seq_prediction_OLD.txt") if -e "seq_prediction.txt";
+step("profiles_gather_export.pl");
+"""
+
 
-        with open(log_file, 'a') as f:
-            f.write(f"\n{'='*60}\n")
-            f.write(f"ERROR in {script_name}\n")
-            f.write(f"{'='*60}\n")
-            f.write(f"{error_msg}\n")
-            if e.stdout:
-                f.write(e.stdout)
-            if e.stderr:
-                f.write("STDERR:\n")
-                f.write(e.stderr)
+def run_perl_pipeline(local_fasta, log_file, verbose=True, cwd=None):
+    """Run all Perl pipeline steps in a single perl process, streaming output to the log."""
+    print(f"Running {len(PIPELINE_SCRIPTS)} pipeline scripts in one perl process...")
+    sys.stdout.flush()
 
+    cmd = ["perl", "-e", PIPELINE_DRIVER, local_fasta]
+    with open(log_file, 'ab', buffering=0) as log, tempfile.TemporaryFile() as err:
+        if verbose:
+            # Tee the driver output to the log and the console as it arrives
+            proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=err)
+            # sys.stdout may be a text-only stream when redirected in-process
+            console = getattr(sys.stdout, 'buffer', None)
+            while chunk := proc.stdout.read1(65536):
+                log.write(chunk)
+                if console is not None:
+                    console.write(chunk)
+                else:
+                    sys.stdout.write(chunk.decode(errors='replace'))
+            sys.stdout.flush()
+            proc.stdout.close()
+            returncode = proc.wait()
+        else:
+            returncode = subprocess.run(cmd, cwd=cwd, stdout=log, stderr=err).returncode
+
+        error_msg = None
+        if returncode != 0:
+            err.seek(0)
+            stderr = err.read().decode(errors='replace')
+            last_line = (stderr.strip().splitlines() or ["perl exited with an error"])[-1]
+            error_msg = f"Error running pipeline: {last_line}"
+
+            log.write(f"\n{'='*60}\nERROR in pipeline\n{'='*60}\n{error_msg}\n".encode())
+
+    if error_msg:
+        print(error_msg, file=sys.stderr)
         return False
 
+    print("✓ Pipeline scripts completed successfully")
+    return True
+
 
 def parse_and_print_predictions(prediction_file):
     """
@@ -210,169 +279,110 @@ def parse_and_print_predictions(prediction_file):
         print(f"Error parsing predictions: {e}", file=sys.stderr)
 
 
-def predict_solubility(fasta_input, verbose=True):
+def predict(fasta_input, quiet=False, output_dir=None):
     """
-    Run the protein-sol prediction pipeline.
+    Run the protein-sol prediction pipeline and return its results.
 
     Args:
         fasta_input: Path to input FASTA file
-        verbose: Whether to print detailed logs to console
+        quiet: Don't echo the Perl output to the console (still logged)
+        output_dir: Directory for the output files (default: the input's directory)
 
     Returns:
-        bool: True if successful, False otherwise
+        DataFrame: ID, sequence and prediction columns (as written to the
+        CSV output; empty if the CSV could not be created), or None if the
+        pipeline failed
     """
+    verbose = not quiet
+
     # Get absolute paths
-    original_dir = Path.cwd()
     fasta_path = Path(fasta_input).resolve()
 
     if not fasta_path.exists():
         print(f"Error: Input file '{fasta_input}' not found", file=sys.stderr)
-        return False
+        return None
 
     # Find protein-sol directory relative to this script's location
     script_dir = Path(__file__).resolve().parent
     protein_sol_dir = script_dir / "protein-sol"
     if not protein_sol_dir.exists():
         print(f"Error: protein-sol directory not found at {protein_sol_dir}", file=sys.stderr)
-        return False
+        return None
 
     print(f"\n{'='*60}")
     print("Starting Protein-Sol Prediction Pipeline")
     print(f"Input: {fasta_input}")
-    print(f"Working directory: {protein_sol_dir}")
+    print(f"Pipeline directory: {protein_sol_dir}")
     print(f"{'='*60}\n")
 
     # Store original fasta filename and directory for output naming
     original_fasta_name = fasta_path.name
-    output_dir = fasta_path.parent
+    output_dir = Path(output_dir).resolve() if output_dir else fasta_path.parent
+
+    # The Perl scripts read and write fixed file names relative to their cwd,
+    # so every call runs in its own directory with the support files linked in
+    working = Path(tempfile.mkdtemp(prefix="protein_sol_"))
 
     try:
-        # Change to protein-sol directory
-        import os
-        os.chdir(protein_sol_dir)
+        stage_support_files(protein_sol_dir, working)
 
         # Use a simple local filename
         local_fasta = "input.fasta"
-        shutil.copy(fasta_path, local_fasta)
+        shutil.copy(fasta_path, working / local_fasta)
 
-        log_file = "run_log"
+        log_file = working / "run_log"
 
         # Initialize log file
         with open(log_file, 'w') as f:
             f.write("Protein-Sol Prediction Pipeline\n")
             f.write(f"Input file: {fasta_input}\n")
             f.write("="*60 + "\n")
-        # Step 1: Reformat FASTA
-        print("Step 1: Reformatting FASTA file...")
-        shutil.copy(local_fasta, "reformat.in")
-
-        if not run_perl_script("fasta_seq_reformat_export.pl", log_file, verbose):
-            os.chdir(original_dir)
-            return False
-
-        # Backup original and replace with reformatted
-        shutil.copy(local_fasta, f"{local_fasta}_ORIGINAL")
-        shutil.move("reformat_out", local_fasta)
-        print(f"✓ Original file backed up to {local_fasta}_ORIGINAL\n")
-
-        # Step 2: Calculate sequence composition
-        print("Step 2: Calculating sequence composition...")
-        shutil.copy(local_fasta, "composition.in")
-
-        if not run_perl_script("seq_compositions_perc_pipeline_export.pl", log_file, verbose):
-            os.chdir(original_dir)
-            return False
-
-        shutil.move("composition_all.out", "seq_composition.txt")
-        print("✓ Composition data saved to seq_composition.txt\n")
-
-        # Step 3: Make solubility predictions
-        print("Step 3: Making solubility predictions...")
+        # Steps 1-5: reformat, composition, prediction, properties, profiles
+        print("Steps 1-5: Running the Perl pipeline...")
 
-        if not run_perl_script("server_prediction_seq_export.pl", log_file, verbose):
-            os.chdir(original_dir)
-            return False
+        if not run_perl_pipeline(local_fasta, log_file, verbose, cwd=working):
+            return None
 
-        print("✓ Predictions generated\n")
-
-        # Step 4: Calculate sequence properties
-        print("Step 4: Calculating sequence properties...")
-        shutil.copy(local_fasta, "seq_props.in")
-
-        if not run_perl_script("seq_props_ALL_export.pl", log_file, verbose):
-            os.chdir(original_dir)
-            return False
-
-        print("✓ Sequence properties calculated\n")
-
-        # Step 5: Gather profiles
-        print("Step 5: Gathering profiles...")
-
-        if Path("seq_prediction.txt").exists():
-            shutil.move("seq_prediction.txt", "seq_prediction_OLD.txt")
-
-        if not run_perl_script("profiles_gather_export.pl", log_file, verbose):
-            os.chdir(original_dir)
-            return False
-
-        print("✓ Profiles gathered\n")
+        print(f"✓ Original file backed up to {local_fasta}_ORIGINAL")
+        print("✓ Composition data saved to seq_composition.txt")
+        print("✓ Predictions generated, properties calculated and profiles gathered\n")
 
         # Step 6: Create CSV output
         print("Step 6: Creating CSV output...")
         # Use the backup file since the original was replaced
-        backup_fasta = f"{local_fasta}_ORIGINAL"
+        backup_fasta = working / f"{local_fasta}_ORIGINAL"
         csv_output_file = f"{original_fasta_name}-protein_sol.csv"
 
-        if not create_csv_output(backup_fasta, "seq_prediction.txt", csv_output_file):
+        results = create_csv_output(backup_fasta, working / "seq_prediction.txt", working / csv_output_file)
+        if results is None:
             print("Warning: Failed to create CSV output", file=sys.stderr)
+            results = pd.DataFrame(columns=['ID', 'sequence'] + PREDICTION_COLUMNS)
         print()
 
-        # Step 7: Cleanup intermediate files
+        # Step 7: Cleanup (intermediate files go with the working directory)
         print("Step 7: Cleaning up intermediate files...")
-        intermediate_files = [
-            "bins.txt",
-            "reformat.in",
-            "seq_props.in",
-            "seq_props.out",
-            "STYprops.out",
-            "composition.in",
-            "seq_prediction_OLD.txt"
-        ]
-
-        for file in intermediate_files:
-            if Path(file).exists():
-                Path(file).unlink()
 
         # Rename log file with proper naming
         log_output_file = f"{original_fasta_name}-protein_sol.log"
-        shutil.move(log_file, log_output_file)
+        shutil.move(log_file, working / log_output_file)
         print("✓ Cleanup completed\n")
 
         # Parse and print prediction results before moving files
         print(f"{'='*60}")
         print("Prediction Results:")
         print(f"{'='*60}")
-        parse_and_print_predictions("seq_prediction.txt")
+        parse_and_print_predictions(working / "seq_prediction.txt")
         print()
 
         # Define output filenames based on input FASTA
         output_prediction_file = f"{original_fasta_name}-protein_sol_prediction.txt"
         output_composition_file = f"{original_fasta_name}-protein_sol_composition.txt"
 
-        # Copy output files to input FASTA directory (only if different from current)
-        current_dir = Path.cwd()
-        if current_dir != output_dir:
-            shutil.copy(csv_output_file, output_dir / csv_output_file)
-            shutil.copy("seq_prediction.txt", output_dir / output_prediction_file)
-            shutil.copy("seq_composition.txt", output_dir / output_composition_file)
-            shutil.copy(log_output_file, output_dir / log_output_file)
-        else:
-            # Already in the output directory, just rename files
-            shutil.move("seq_prediction.txt", output_prediction_file)
-            shutil.move("seq_composition.txt", output_composition_file)
-
-        # Change back to original directory
-        os.chdir(original_dir)
+        # Move output files to the output directory
+        shutil.move(working / csv_output_file, output_dir / csv_output_file)
+        shutil.move(working / "seq_prediction.txt", output_dir / output_prediction_file)
+        shutil.move(working / "seq_composition.txt", output_dir / output_composition_file)
+        shutil.move(working / log_output_file, output_dir / log_output_file)
 
         print(f"{'='*60}")
         print("Pipeline completed successfully!")
@@ -383,18 +393,31 @@ def predict_solubility(fasta_input, verbose=True):
         print(f"  - {output_composition_file}: Sequence composition data")
         print(f"  - {log_output_file}        : Detailed execution log\n")
 
-        return True
+        return results
 
     except Exception as e:
         print(f"\nError during pipeline execution: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
-        # Make sure to change back to original directory on error
-        try:
-            os.chdir(original_dir)
-        except:
-            pass
-        return False
+        return None
+
+    finally:
+        shutil.rmtree(working, ignore_errors=True)
+
+
+def predict_solubility(fasta_input, verbose=True, output_dir=None):
+    """
+    Run the protein-sol prediction pipeline.
+
+    Args:
+        fasta_input: Path to input FASTA file
+        verbose: Whether to print detailed logs to console
+        output_dir: Directory for the output files (default: the input's directory)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return predict(fasta_input, quiet=not verbose, output_dir=output_dir) is not None
 
 
 def main():
@@ -406,7 +429,7 @@ Examples:
   python protein_sol_predict.py input.fasta
   python protein_sol_predict.py input.fasta --quiet
 
-Output (saved in same directory as input FASTA):
+Output (saved in the same directory as the input FASTA, or --output-dir):
   input.fasta-protein_sol.csv            - CSV with ID, sequence, and metrics
   input.fasta-protein_sol_prediction.txt - Main prediction results
   input.fasta-protein_sol_composition.txt- Sequence composition data
@@ -425,9 +448,14 @@ Output (saved in same directory as input FASTA):
         help="Suppress detailed console output (still writes to log)"
     )
 
+    parser.add_argument(
+        "-o", "--output-dir",
+        help="Directory for the output files (default: the input FASTA's directory)"
+    )
+
     args = parser.parse_args()
 
-    success = predict_solubility(args.fasta_file, verbose=not args.quiet)
+    success = predict_solubility(args.fasta_file, verbose=not args.quiet, output_dir=args.output_dir)
 
     sys.exit(0 if success else 1)
 
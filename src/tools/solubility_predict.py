@@ -2,17 +2,441 @@
 Protein solubility prediction tool using protein-sol pipeline.
 """
 
+import asyncio
 import csv
-import subprocess
+import hashlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stderr, redirect_stdout
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from fastmcp import FastMCP
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # Create the MCP instance for solubility prediction tools
 protein_sol_solubility_predict_mcp = FastMCP("protein_sol_solubility_predict")
 
+# Prediction script, resolved once at import (_SCRIPT_PATH is None if it is missing)
+_SCRIPT_LOCATION = Path(__file__).resolve().parent.parent.parent / "scripts" / "protein_sol_predict.py"
+_SCRIPT_PATH: Optional[Path] = _SCRIPT_LOCATION if _SCRIPT_LOCATION.exists() else None
+
+# Temporary FASTA files go where the scripts put their working dirs
+if str(_SCRIPT_LOCATION.parent) not in sys.path:
+    sys.path.append(str(_SCRIPT_LOCATION.parent))
+try:
+    from lib.protein_sol import PREDICTION_FILES, pick_tmp_root
+except ImportError:
+    PREDICTION_FILES = ()
+
+    def pick_tmp_root() -> Optional[str]:
+        return None
+
+# Number of FASTA records buffered before each write
+FASTA_WRITE_BATCH = 8192
+
+# Prediction CSV column -> key in the returned prediction dicts
+PREDICTION_KEYS = {
+    "ID": "ID",
+    "sequence": "sequence",
+    "percent-sol": "percent_sol",
+    "scaled-sol": "scaled_sol",
+    "population-sol": "population_sol",
+    "pI": "pI"
+}
+
+# Fetches the PREDICTION_KEYS columns of a prediction CSV row in one call
+_PREDICTION_GETTER = itemgetter(*PREDICTION_KEYS)
+_PREDICTION_FIELDS = tuple(PREDICTION_KEYS.values())
+
+# Larger result sets are returned as predictions_csv_path instead of a list
+MAX_INLINE_PREDICTIONS = 10_000
+
+# Prediction values used in the augmented CSV for rows without a prediction
+EMPTY_PRED = {"percent_sol": "", "scaled_sol": "", "population_sol": "", "pI": ""}
+
+# Sequence cache size; least recently used entries are evicted beyond this
+CACHE_MAX_ENTRIES = 100_000
+
+
+@lru_cache(maxsize=None)
+def _load_predict(script_path: Path) -> Optional[Callable]:
+    """Import predict() from the prediction script, or None if it cannot be imported."""
+    try:
+        spec = importlib.util.spec_from_file_location("protein_sol_predict", script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.predict
+    except Exception:
+        return None
+
+
+def _csv_rows(reader, width: int):
+    """Yield csv.reader rows the way DictReader sees them: blank lines skipped, short rows padded."""
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row += [''] * (width - len(row))
+        yield row
+
+
+def _arrow_batches(csv_path: Path, headers: List[str]):
+    """
+    Stream a CSV as Arrow record batches with every column read as text.
+
+    Raises ValueError (pyarrow.ArrowInvalid included) if Arrow would read the
+    file differently from the csv module, so callers can fall back to it.
+    """
+    reader = pa_csv.open_csv(
+        csv_path,
+        convert_options=pa_csv.ConvertOptions(column_types={h: pa.string() for h in headers})
+    )
+    if reader.schema.names != headers or any(t != pa.string() for t in reader.schema.types):
+        raise ValueError("Arrow and csv disagree on the CSV header")
+    return reader
+
+
+def _csv_to_fasta_arrow(csv_path: Path, headers: List[str], seq_idx: int,
+                        id_idx: Optional[int], out, cache: Optional["_SequenceCache"] = None,
+                        cached: Optional[Dict[str, Dict]] = None) -> int:
+    """
+    Write FASTA records for the non-empty sequences of a CSV; returns the row count.
+
+    With a _SequenceCache, sequences it already knows are collected into
+    cached instead of being written.
+    """
+    n_rows = 0
+    for batch in _arrow_batches(csv_path, headers):
+        seqs = pc.utf8_trim_whitespace(batch.column(seq_idx))
+        rows = pc.indices_nonzero(pc.not_equal(seqs, ''))
+        if id_idx is not None:
+            ids = pc.take(batch.column(id_idx), rows).to_pylist()
+        else:
+            ids = [f"row_{n_rows + i}" for i in rows.to_pylist()]
+        records = zip(ids, pc.take(seqs, rows).to_pylist())
+        if cache is not None:
+            records = cache.split(records, cached)
+        out.writelines(f">{seq_id}\n{seq}\n" for seq_id, seq in records)
+        n_rows += batch.num_rows
+    return n_rows
+
+
+def _augment_csv_arrow(csv_path: Path, headers: List[str], id_idx: Optional[int],
+                       prediction_dict: Dict[str, Dict], writer) -> None:
+    """Write CSV rows with their prediction columns appended, joining on ID in Arrow."""
+    pred_ids = pa.array(list(prediction_dict), pa.string())
+    pred_cols = [
+        pa.array([pred[key] for pred in prediction_dict.values()], pa.string())
+        for key in ("percent_sol", "scaled_sol", "population_sol", "pI")
+    ]
+
+    n_rows = 0
+    for batch in _arrow_batches(csv_path, headers):
+        if id_idx is not None:
+            ids = batch.column(id_idx)
+        else:
+            ids = pa.array([f"row_{i}" for i in range(n_rows, n_rows + batch.num_rows)])
+        pos = pc.index_in(ids, value_set=pred_ids)
+        extra = [pc.fill_null(pc.take(col, pos), '') for col in pred_cols]
+        writer.writerows(zip(*(col.to_pylist() for col in batch.columns + extra)))
+        n_rows += batch.num_rows
+
+
+def _open_temp_fasta():
+    """Create a temporary .fasta file; returns (path, text file with a 1 MiB buffer)."""
+    # A real file rather than stdin: protein_sol_predict.py names its outputs
+    # after the input path and stages that file for the Perl scripts. The file
+    # lives on tmpfs when pick_tmp_root finds room there, so it stays off disk.
+    fd, path = tempfile.mkstemp(suffix='.fasta', dir=pick_tmp_root())
+    return path, os.fdopen(fd, 'w', buffering=1 << 20)
+
+
+@lru_cache(maxsize=8)
+def _digest_files(stamps: tuple) -> str:
+    """Content digest of the (path, mtime_ns, size) files; re-read only when a stamp changes."""
+    h = hashlib.sha1()
+    for path, _, _ in stamps:
+        try:
+            h.update(Path(path).read_bytes())
+        except OSError:
+            h.update(b"missing")
+    return h.hexdigest()[:16]
+
+
+def _pipeline_version() -> str:
+    """Digest of the prediction script and the protein-sol files it runs."""
+    protein_sol_dir = _SCRIPT_LOCATION.parent / "protein-sol"
+    stamps = []
+    for path in [_SCRIPT_LOCATION] + [protein_sol_dir / name for name in PREDICTION_FILES]:
+        try:
+            st = path.stat()
+            stamps.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append((str(path), 0, -1))
+    return _digest_files(tuple(stamps))
+
+
+class _SequenceCache:
+    """
+    On-disk predictions keyed by sequence and pipeline version, one JSON file
+    per sequence under $PROTEIN_SOL_CACHE/sequences (default
+    ~/.cache/protein_sol/sequences).
+
+    Lookups open the entry file directly. A hit bumps its mtime, and once
+    new entries are stored the least recently used ones beyond
+    CACHE_MAX_ENTRIES are removed.
+    """
+
+    def __init__(self):
+        base = os.environ.get("PROTEIN_SOL_CACHE", Path.home() / ".cache" / "protein_sol")
+        self.root = Path(base) / "sequences"
+        self.version = _pipeline_version()
+        self.misses = 0
+
+    @staticmethod
+    def normalize(seq: str) -> str:
+        """Sequence as the pipeline reads it: whitespace removed, upper-case."""
+        return ''.join(seq.split()).upper()
+
+    def key(self, seq: str) -> str:
+        return hashlib.sha1(f"{self.version}:{seq}".encode()).hexdigest()[:16]
+
+    def get(self, seq_id: str, seq: str) -> Optional[Dict[str, str]]:
+        """
+        Cached prediction for seq labelled seq_id, or None (counted in misses).
+
+        The prediction carries seq as given, like the rows the pipeline
+        returns, not its normalized form.
+        """
+        normalized = self.normalize(seq)
+        path = self.root / f"{self.key(normalized)}.json"
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            if entry.pop("sequence") == normalized:
+                os.utime(path)
+                return {"ID": seq_id, "sequence": seq, **entry}
+        except (OSError, ValueError, KeyError):
+            pass
+        self.misses += 1
+        return None
+
+    def split(self, records, cached: Dict[str, Dict]):
+        """Yield the (id, sequence) records without a cached prediction; hits go into cached."""
+        for seq_id, seq in records:
+            pred = self.get(seq_id, seq)
+            if pred is None:
+                yield seq_id, seq
+            else:
+                cached[seq_id] = pred
+
+    def put(self, predictions) -> None:
+        """Store new predictions; written via rename so readers never see partial files."""
+        added = 0
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            for pred in predictions:
+                seq = self.normalize(pred["sequence"])
+                path = self.root / f"{self.key(seq)}.json"
+                if path.exists():
+                    continue
+                entry = {field: pred[field] for field in EMPTY_PRED}
+                entry["sequence"] = seq
+                tmp = self.root / f"{path.stem}.tmp{os.getpid()}"
+                with open(tmp, 'w') as f:
+                    json.dump(entry, f)
+                os.replace(tmp, path)
+                added += 1
+            if added:
+                self._evict()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries beyond CACHE_MAX_ENTRIES."""
+        with os.scandir(self.root) as it:
+            entries = [e for e in it if e.name.endswith(".json")]
+        if len(entries) <= CACHE_MAX_ENTRIES:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime_ns)
+        for entry in entries[:len(entries) - CACHE_MAX_ENTRIES]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+# Long-lived prediction workers, created on first use. Concurrent tool calls
+# run in parallel on up to PROTEIN_SOL_WORKERS processes (default: CPU count).
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+
+
+def _worker_count() -> int:
+    """Size of the prediction worker pool."""
+    try:
+        return max(1, int(os.environ["PROTEIN_SOL_WORKERS"]))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+def _preload(script_path: Path) -> None:
+    """Worker initializer: import numpy, pandas and the prediction script up front."""
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    _load_predict(script_path)
+
+
+def _get_executor(script_path: Path) -> ProcessPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        try:
+            ctx = multiprocessing.get_context('forkserver')
+        except ValueError:
+            ctx = multiprocessing.get_context('spawn')
+        _EXECUTOR = ProcessPoolExecutor(
+            max_workers=_worker_count(), mp_context=ctx, initializer=_preload, initargs=(script_path,)
+        )
+    return _EXECUTOR
+
+
+def _run_predict(script_path: Path, input_fasta: str, quiet: bool, output_dir: Path,
+                 as_list: bool = True):
+    """
+    Run predict() in the worker, capturing what the script would print.
+
+    Returns:
+        (predictions or None on failure, stdout, stderr); predictions is a
+        list of dicts, or a dict of them by ID when as_list is False
+    """
+    predict = _load_predict(script_path)
+    if predict is None:
+        raise ImportError(f"Cannot import predict() from {script_path}")
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        df = predict(input_fasta, quiet, output_dir=output_dir)
+    if df is None:
+        predictions = None
+    elif as_list:
+        predictions = df.rename(columns=PREDICTION_KEYS).to_dict('records')
+    else:
+        predictions = {
+            vals[0]: dict(zip(_PREDICTION_FIELDS, vals))
+            for vals in df[list(PREDICTION_KEYS)].itertuples(index=False, name=None)
+        }
+    return predictions, stdout.getvalue(), stderr.getvalue()
+
+
+async def _predict_in_worker(script_path: Path, input_fasta: str, quiet: bool, output_dir: Path,
+                             as_list: bool):
+    """
+    Run _run_predict on a warm worker.
+
+    Returns None if the script cannot be imported there, if the pool cannot
+    start, or if the worker died twice in a row; callers then run the script
+    in a subprocess.
+    """
+    global _EXECUTOR
+    for _ in range(2):
+        executor = None
+        try:
+            executor = _get_executor(script_path)
+            future = executor.submit(_run_predict, script_path, input_fasta, quiet, output_dir, as_list)
+            return await asyncio.wrap_future(future)
+        except ImportError:
+            return None
+        except BrokenProcessPool:
+            # A worker that crashed (OOM, segfault) leaves the pool unusable;
+            # drop it so the next attempt starts a fresh one
+            if _EXECUTOR is executor:
+                _EXECUTOR = None
+            executor.shutdown(wait=False)
+        except (OSError, RuntimeError, NotImplementedError):
+            # The pool could not start (no __main__ guard in a spawn/forkserver
+            # driver, no semaphores or /dev/shm); do not keep a half-made one
+            if executor is not None:
+                executor.shutdown(wait=False)
+            _EXECUTOR = None
+            return None
+    return None
+
+
+async def _run_pipeline(script_path: Path, input_fasta: str, prediction_csv: Path, quiet: bool,
+                        as_list: bool = True):
+    """
+    Predict input_fasta on a warm worker, or in a separate interpreter if
+    predict() cannot be imported there. Output files go to the directory of
+    prediction_csv.
+
+    Returns:
+        (predictions, stdout, None) on success, or (None, stdout, error response);
+        predictions is a list of dicts, or a dict of them by ID when as_list
+        is False
+    """
+    # Run on a warm worker process so the event loop stays free
+    output_dir = prediction_csv.parent
+    outcome = await _predict_in_worker(script_path, input_fasta, quiet, output_dir, as_list)
+    if outcome is not None:
+        predictions, stdout, stderr = outcome
+        if predictions is None:
+            return None, stdout, {
+                "success": False,
+                "error": "Prediction failed",
+                "stderr": stderr,
+                "stdout": stdout
+            }
+        return predictions, stdout, None
+
+    cmd = ["python3", str(script_path), input_fasta, "--output-dir", str(output_dir)]
+    if quiet:
+        cmd.append("--quiet")
+
+    # Awaited so the event loop keeps serving other requests meanwhile
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    out_bytes, err_bytes = await proc.communicate()
+    stdout = out_bytes.decode(errors='replace')
+
+    if proc.returncode != 0:
+        return None, stdout, {
+            "success": False,
+            "error": f"Prediction failed with exit code {proc.returncode}",
+            "stderr": err_bytes.decode(errors='replace'),
+            "stdout": stdout
+        }
+
+    # Parse results from the generated CSV file
+    predictions = [] if as_list else {}
+    if prediction_csv.exists():
+        with open(prediction_csv, 'r') as f:
+            for row in csv.DictReader(f):
+                vals = _PREDICTION_GETTER(row)
+                if as_list:
+                    predictions.append(dict(zip(_PREDICTION_FIELDS, vals)))
+                else:
+                    predictions[vals[0]] = dict(zip(_PREDICTION_FIELDS, vals))
+    return predictions, stdout, None
+
 
 @protein_sol_solubility_predict_mcp.tool()
 async def protein_sol_solubility_predict(
@@ -22,7 +446,9 @@ async def protein_sol_solubility_predict(
     sequence_column: str = "sequence",
     id_column: Optional[str] = None,
     sequence_id: str = "protein",
-    quiet: bool = False
+    quiet: bool = False,
+    return_predictions: bool = True,
+    use_cache: bool = False
 ) -> Dict:
     """
     Run complete automated protein solubility prediction pipeline.
@@ -46,6 +472,17 @@ async def protein_sol_solubility_predict(
         sequence_id: ID to use for the sequence when creating temporary FASTA
                     (default: "protein"). Only used if sequence is provided.
         quiet: Suppress detailed console output (default: False)
+        return_predictions: Include the per-sequence predictions in the result
+                           (default: True). With False, only predictions_count
+                           is returned and the predictions are read from the
+                           output files instead.
+        use_cache: Reuse earlier predictions of identical sequences for sequence
+                  and csv_file input, and store new ones (default: False).
+                  Cached sequences are not run through the pipeline, so the
+                  prediction, composition and log files cover only the
+                  uncached ones (the augmented CSV still has every row). If
+                  every sequence is cached, the pipeline is not run at all:
+                  those output_files are None and stdout is None.
 
     Returns:
         Dictionary containing:
@@ -57,6 +494,11 @@ async def protein_sol_solubility_predict(
                 - scaled_sol: Scaled solubility score
                 - population_sol: Population average solubility
                 - pI: Isoelectric point
+            - predictions_count: Number of predictions, returned instead of
+              predictions with return_predictions=False
+            - predictions_csv_path: Path of the CSV in output_files, returned with
+              predictions_count instead of predictions when there are more
+              than MAX_INLINE_PREDICTIONS
             - output_files: Dictionary of generated file paths:
                 - csv: CSV file with all results (for csv_file input, this is the augmented CSV)
                 - prediction: Main prediction results file
@@ -94,18 +536,28 @@ async def protein_sol_solubility_predict(
     if inputs_provided > 1:
         raise ValueError("Provide only one of 'sequence', 'fasta_file', or 'csv_file'")
 
-    # Get the script path
-    script_path = Path(__file__).resolve().parent.parent.parent / "scripts" / "protein_sol_predict.py"
-    if not script_path.exists():
+    script_path = _SCRIPT_PATH
+    if script_path is None:
+        return {
+            "success": False,
+            "error": f"Prediction script not found at {_SCRIPT_LOCATION}"
+        }
+
+    # Only a user-supplied FASTA can be missing; the temporary ones are ours
+    if fasta_file is not None and not Path(fasta_file).exists():
         return {
             "success": False,
-            "error": f"Prediction script not found at {script_path}"
+            "error": f"Input FASTA file not found: {fasta_file}"
         }
 
-    temp_fasta = None
+    temp_fasta = None  # path of the FASTA we write (and remove) ourselves
     input_fasta = fasta_file
     is_csv_input = csv_file is not None
-    csv_data = None
+
+    # Predictions found in the sequence cache, by ID; only those sequences are
+    # left out of the FASTA we write, so user FASTA files are never split
+    cache = _SequenceCache() if use_cache and fasta_file is None else None
+    cached = {}
 
     try:
         # Handle CSV file input
@@ -117,168 +569,197 @@ async def protein_sol_solubility_predict(
                     "error": f"CSV file not found: {csv_file}"
                 }
 
-            # Read CSV file
-            with open(csv_path, 'r') as f:
-                reader = csv.DictReader(f)
-                csv_data = list(reader)
+            # Stream the CSV once to write the FASTA; rows are not kept in
+            # memory, the augmented CSV is written from a second pass
+            with open(csv_path, 'r', newline='') as f:
+                reader = csv.reader(f)
+                headers = next(reader, None)
 
-            # Validate sequence column exists
-            if not csv_data:
-                return {
-                    "success": False,
-                    "error": "CSV file is empty"
-                }
+                if not headers:
+                    return {
+                        "success": False,
+                        "error": "CSV file is empty"
+                    }
 
-            if sequence_column not in csv_data[0]:
-                return {
-                    "success": False,
-                    "error": f"Column '{sequence_column}' not found in CSV. Available columns: {', '.join(csv_data[0].keys())}"
-                }
+                # Validate sequence column exists
+                if sequence_column not in headers:
+                    return {
+                        "success": False,
+                        "error": f"Column '{sequence_column}' not found in CSV. Available columns: {', '.join(headers)}"
+                    }
 
-            # Validate id_column if specified
-            if id_column and id_column not in csv_data[0]:
+                # Validate id_column if specified
+                if id_column and id_column not in headers:
+                    return {
+                        "success": False,
+                        "error": f"Column '{id_column}' not found in CSV. Available columns: {', '.join(headers)}"
+                    }
+
+                seq_idx = headers.index(sequence_column)
+                id_idx = headers.index(id_column) if id_column else None
+
+                # Create temporary FASTA file from CSV sequences
+                temp_fasta, out = _open_temp_fasta()
+
+                # Arrow parses the file in C++ batches; the csv module handles
+                # anything Arrow reads differently (e.g. ragged rows)
+                use_arrow = PYARROW_AVAILABLE
+                if use_arrow:
+                    try:
+                        n_rows = _csv_to_fasta_arrow(csv_path, headers, seq_idx, id_idx, out, cache, cached)
+                    except ValueError:
+                        use_arrow = False
+                        out.seek(0)
+                        out.truncate()
+                        cached.clear()
+                        if cache is not None:
+                            cache.misses = 0
+
+                if not use_arrow:
+                    # Records are written in batches of FASTA_WRITE_BATCH
+                    buf = []
+                    append = buf.append
+                    n_rows = 0
+                    for idx, row in enumerate(_csv_rows(reader, len(headers))):
+                        n_rows += 1
+                        seq = row[seq_idx].strip()
+                        if not seq:
+                            continue
+
+                        # Use id_column if specified, otherwise use row index
+                        seq_id = row[id_idx] if id_idx is not None else f"row_{idx}"
+                        if cache is not None:
+                            pred = cache.get(seq_id, seq)
+                            if pred is not None:
+                                cached[seq_id] = pred
+                                continue
+                        append(f">{seq_id}\n{seq}\n")
+                        if len(buf) >= FASTA_WRITE_BATCH:
+                            out.writelines(buf)
+                            buf.clear()
+
+                    out.writelines(buf)
+
+                out.close()
+                input_fasta = temp_fasta
+
+            if n_rows == 0:
                 return {
                     "success": False,
-                    "error": f"Column '{id_column}' not found in CSV. Available columns: {', '.join(csv_data[0].keys())}"
+                    "error": "CSV file is empty"
                 }
 
-            # Create temporary FASTA file from CSV sequences
-            temp_fasta = tempfile.NamedTemporaryFile(
-                mode='w',
-                suffix='.fasta',
-                delete=False
-            )
-
-            for idx, row in enumerate(csv_data):
-                seq = row[sequence_column]
-                if not seq or seq.strip() == '':
-                    continue
-
-                # Use id_column if specified, otherwise use row index
-                seq_id = row[id_column] if id_column else f"row_{idx}"
-                temp_fasta.write(f">{seq_id}\n")
-                temp_fasta.write(f"{seq.strip()}\n")
-
-            temp_fasta.close()
-            input_fasta = temp_fasta.name
-
         # Create temporary FASTA file if sequence provided
         elif sequence is not None:
-            temp_fasta = tempfile.NamedTemporaryFile(
-                mode='w',
-                suffix='.fasta',
-                delete=False
-            )
-            temp_fasta.write(f">{sequence_id}\n")
-            temp_fasta.write(f"{sequence}\n")
-            temp_fasta.close()
-            input_fasta = temp_fasta.name
-
-        # Validate input FASTA exists
-        if not Path(input_fasta).exists():
-            return {
-                "success": False,
-                "error": f"Input FASTA file not found: {input_fasta}"
-            }
-
-        # Build command
-        cmd = ["python3", str(script_path), input_fasta]
-        if quiet:
-            cmd.append("--quiet")
-
-        # Run the prediction script
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=False
-        )
-
-        if result.returncode != 0:
-            return {
-                "success": False,
-                "error": f"Prediction failed with exit code {result.returncode}",
-                "stderr": result.stderr,
-                "stdout": result.stdout
-            }
-
-        # Parse results from the generated CSV file
+            pred = cache.get(sequence_id, sequence) if cache is not None else None
+            if pred is not None:
+                response = {"success": True}
+                if return_predictions:
+                    response["predictions"] = [pred]
+                else:
+                    response["predictions_count"] = 1
+                response["output_files"] = {"csv": None, "prediction": None, "composition": None, "log": None}
+                response["stdout"] = None
+                return response
+
+            temp_fasta, out = _open_temp_fasta()
+            with out:
+                out.write(f">{sequence_id}\n{sequence}\n")
+            input_fasta = temp_fasta
+
+        # Output files are written next to a user FASTA; for our temporary
+        # one they go to the system temp dir so only the FASTA sits on tmpfs
         input_path = Path(input_fasta)
-        output_dir = input_path.parent
-        prediction_csv = output_dir / f"{input_path.name}-protein_sol.csv"
-        prediction_file = output_dir / f"{input_path.name}-protein_sol_prediction.txt"
-        composition_file = output_dir / f"{input_path.name}-protein_sol_composition.txt"
-        log_file = output_dir / f"{input_path.name}-protein_sol.log"
+        output_dir = Path(tempfile.gettempdir()) if temp_fasta is not None else input_path.parent
+        name = input_path.name
+        prediction_csv = output_dir / f"{name}-protein_sol.csv"
+        prediction_file = output_dir / f"{name}-protein_sol_prediction.txt"
+        composition_file = output_dir / f"{name}-protein_sol_composition.txt"
+        log_file = output_dir / f"{name}-protein_sol.log"
 
         predictions = []
         prediction_dict = {}
 
-        if prediction_csv.exists():
-            with open(prediction_csv, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    pred = {
-                        "ID": row["ID"],
-                        "sequence": row["sequence"],
-                        "percent_sol": row["percent-sol"],
-                        "scaled_sol": row["scaled-sol"],
-                        "population_sol": row["population-sol"],
-                        "pI": row["pI"]
-                    }
-                    predictions.append(pred)
-                    prediction_dict[row["ID"]] = pred
+        # The list is only built when it is returned; the augmented CSV and
+        # the cache work from prediction_dict
+        as_list = not is_csv_input or return_predictions
+
+        # Only sequences missing from the cache go through the pipeline
+        stdout = None
+        if not cached or cache.misses:
+            result, stdout, failure = await _run_pipeline(
+                script_path, input_fasta, prediction_csv, quiet, as_list
+            )
+
+            # The pipeline fails on a FASTA with no usable sequence, which can
+            # be all that is left once cached ones are taken out: rerun on the
+            # full input so the outcome matches an uncached run
+            if failure is not None and cached:
+                with open(input_fasta, 'a') as out:
+                    out.writelines(f">{seq_id}\n{pred['sequence']}\n" for seq_id, pred in cached.items())
+                cached.clear()
+                result, stdout, failure = await _run_pipeline(
+                    script_path, input_fasta, prediction_csv, quiet, as_list
+                )
+
+            if failure is not None:
+                return failure
+
+            if as_list:
+                predictions = result
+                prediction_dict = {pred["ID"]: pred for pred in predictions}
+            else:
+                prediction_dict = result
+            if cache is not None:
+                cache.put(prediction_dict.values())
+
+        if cached:
+            prediction_dict.update(cached)
+            if as_list:
+                predictions = list(prediction_dict.values())
 
         # Handle CSV input: create augmented CSV
         output_csv_path = prediction_csv
-        if is_csv_input and csv_data:
-            csv_input_path = Path(csv_file)
-            augmented_csv_path = csv_input_path.parent / f"{csv_input_path.name}_protein_sol.csv"
-
-            # Get original CSV headers
-            original_headers = list(csv_data[0].keys())
-            new_headers = original_headers + ['percent-sol', 'scaled-sol', 'population-sol', 'pI']
-
-            # Write augmented CSV
-            with open(augmented_csv_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=new_headers)
-                writer.writeheader()
-
-                for idx, row in enumerate(csv_data):
-                    # Get the ID that was used in the FASTA
-                    seq_id = row[id_column] if id_column else f"row_{idx}"
-
-                    # Copy original row data
-                    new_row = row.copy()
-
-                    # Add prediction data if available
-                    if seq_id in prediction_dict:
-                        pred = prediction_dict[seq_id]
-                        new_row['percent-sol'] = pred['percent_sol']
-                        new_row['scaled-sol'] = pred['scaled_sol']
-                        new_row['population-sol'] = pred['population_sol']
-                        new_row['pI'] = pred['pI']
-                    else:
-                        # No prediction found (e.g., empty sequence)
-                        new_row['percent-sol'] = ''
-                        new_row['scaled-sol'] = ''
-                        new_row['population-sol'] = ''
-                        new_row['pI'] = ''
-
-                    writer.writerow(new_row)
+        if is_csv_input:
+            augmented_csv_path = csv_path.parent / f"{csv_path.name}_protein_sol.csv"
+
+            # Write augmented CSV, streaming the input a second time
+            with open(csv_path, 'r', newline='') as src, open(augmented_csv_path, 'w', newline='') as f:
+                reader = csv.reader(src)
+                headers = next(reader)
+                writer = csv.writer(f)
+                writer.writerow(headers + ['percent-sol', 'scaled-sol', 'population-sol', 'pI'])
+
+                if use_arrow:
+                    _augment_csv_arrow(csv_path, headers, id_idx, prediction_dict, writer)
+                else:
+                    for idx, row in enumerate(_csv_rows(reader, len(headers))):
+                        # Get the ID that was used in the FASTA
+                        seq_id = row[id_idx] if id_idx is not None else f"row_{idx}"
+
+                        # Append prediction data (blank if none, e.g. empty sequence)
+                        pred = prediction_dict.get(seq_id, EMPTY_PRED)
+                        row += (pred['percent_sol'], pred['scaled_sol'], pred['population_sol'], pred['pI'])
+                        writer.writerow(row)
 
             output_csv_path = augmented_csv_path
 
-        return {
-            "success": True,
-            "predictions": predictions,
-            "output_files": {
-                "csv": str(output_csv_path) if output_csv_path.exists() else None,
-                "prediction": str(prediction_file) if prediction_file.exists() else None,
-                "composition": str(composition_file) if composition_file.exists() else None,
-                "log": str(log_file) if log_file.exists() else None
-            },
-            "stdout": result.stdout if not quiet else None
+        response = {"success": True}
+        if not return_predictions:
+            response["predictions_count"] = len(predictions) if as_list else len(prediction_dict)
+        elif len(predictions) > MAX_INLINE_PREDICTIONS:
+            response["predictions_count"] = len(predictions)
+            response["predictions_csv_path"] = str(output_csv_path)
+        else:
+            response["predictions"] = predictions
+        response["output_files"] = {
+            "csv": str(output_csv_path) if output_csv_path.exists() else None,
+            "prediction": str(prediction_file) if prediction_file.exists() else None,
+            "composition": str(composition_file) if composition_file.exists() else None,
+            "log": str(log_file) if log_file.exists() else None
         }
+        response["stdout"] = stdout if not quiet else None
+        return response
 
     except Exception as e:
         return {
@@ -290,6 +771,6 @@ async def protein_sol_solubility_predict(
         # Clean up temporary FASTA file
         if temp_fasta is not None:
             try:
-                Path(temp_fasta.name).unlink()
-            except Exception:
+                os.unlink(temp_fasta)
+            except OSError:
                 pass
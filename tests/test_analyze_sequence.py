@@ -0,0 +1,58 @@
+"""
+Tests for the basic statistics in scripts/analyze_sequence.py.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from analyze_sequence import AMINO_ACIDS, calculate_basic_stats, calculate_basic_stats_batch  # noqa: E402
+
+
+def reference_stats(seq):
+    """Per-residue str.count version of the statistics, as originally written."""
+    aa_counts = {aa: seq.count(aa) for aa in AMINO_ACIDS}
+    total = sum(aa_counts.values())
+    groups = {
+        name: sum(aa_counts[aa] for aa in residues)
+        for name, residues in (('hydrophobic', 'AILMFPWV'), ('charged', 'DEKR'), ('polar', 'NQSTY'))
+    }
+    stats = {'length': len(seq), 'molecular_weight': total * 110, 'amino_acid_composition': aa_counts}
+    for name, count in groups.items():
+        stats[f'{name}_residues'] = count
+        stats[f'{name}_percent'] = count / total * 100 if total else 0
+    return stats
+
+
+def test_batch_matches_per_sequence_counts():
+    sequences = [
+        ("lyso", "KVFERCELARTLKRLGMDGYRGISLANWMCLAKWESGYNTRATNYNAGDRSTDYGIFQ"),
+        ("with_x", "MKXXALBZIVLG*"),
+        ("single", "W"),
+    ]
+    results = calculate_basic_stats_batch(sequences)
+
+    assert list(results) == ["lyso", "with_x", "single"]
+    for seq_id, seq in sequences:
+        expected = reference_stats(seq)
+        stats = results[seq_id]
+        assert stats.keys() == expected.keys()
+        for key, value in expected.items():
+            assert stats[key] == pytest.approx(value), (seq_id, key)
+
+
+def test_batch_uppercases_and_handles_empty_sequences():
+    results = calculate_basic_stats_batch([("lower", "mkal"), ("empty", "")])
+
+    assert results["lower"] == reference_stats("MKAL")
+    assert results["empty"]['length'] == 0
+    assert results["empty"]['hydrophobic_percent'] == 0
+    assert sum(results["empty"]['amino_acid_composition'].values()) == 0
+
+
+def test_single_sequence_strips_whitespace():
+    assert calculate_basic_stats(" mkal\nIV LG\t") == reference_stats("MKALIVLG")
+    assert calculate_basic_stats("") == calculate_basic_stats_batch([("x", "")])["x"]
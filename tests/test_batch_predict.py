@@ -0,0 +1,43 @@
+"""
+Tests for scripts/batch_predict.py that do not need Perl.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from batch_predict import summarize_results  # noqa: E402
+
+
+def make_result(status, processing_time):
+    return {'file': 'x.fasta', 'status': status, 'processing_time': processing_time,
+            'output_files': {}, 'error': None if status == 'success' else 'boom'}
+
+
+def test_summarize_results():
+    results = [make_result('success', 1.5), make_result('error', 0.5), make_result('success', 4.0)]
+    summary = summarize_results(results)
+
+    assert summary == {
+        'total_files': 3,
+        'successful': 2,
+        'failed': 1,
+        'success_rate': pytest.approx(200 / 3),
+        'total_time': pytest.approx(6.0),
+        'total_processing_time': pytest.approx(6.0),
+        'average_time': pytest.approx(2.0),
+    }
+    assert all(type(summary[key]) is int for key in ('total_files', 'successful', 'failed'))
+
+    # Wall-clock time of a parallel run is reported separately from the sum
+    assert summarize_results(results, total_time=4.2)['total_time'] == 4.2
+
+
+def test_summarize_results_empty():
+    summary = summarize_results([])
+    assert summary['total_files'] == 0
+    assert summary['success_rate'] == 0
+    assert summary['average_time'] == 0
@@ -0,0 +1,100 @@
+"""
+Tests for scripts/lib/io.py.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from lib.io import MMAP_THRESHOLD, parse_results_csv, read_fasta, read_prediction_rows  # noqa: E402
+
+
+def write_bytes(tmp_path, data, name="input.fasta"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def test_read_fasta_joins_multiline_records(tmp_path):
+    path = write_bytes(tmp_path, b">p1 first protein\nMKAL\nIVLG\n>p2\nKVFE\nRCEL\nARTL\n")
+    assert read_fasta(path) == [("p1 first protein", "MKALIVLG"), ("p2", "KVFERCELARTL")]
+
+
+def test_read_fasta_skips_blank_lines_and_leading_text(tmp_path):
+    path = write_bytes(tmp_path, b"; comment\n\n>p1\n\nMKAL\n\nIVLG\n\n>p2\nKVFE\n\n")
+    assert read_fasta(path) == [("p1", "MKALIVLG"), ("p2", "KVFE")]
+
+
+def test_read_fasta_without_trailing_newline(tmp_path):
+    path = write_bytes(tmp_path, b">p1\nMKAL\n>p2\nKVFE")
+    assert read_fasta(path) == [("p1", "MKAL"), ("p2", "KVFE")]
+
+    # A header on the last line gives an empty record
+    path = write_bytes(tmp_path, b">p1\nMKAL\n>p2", "header_last.fasta")
+    assert read_fasta(path) == [("p1", "MKAL"), ("p2", "")]
+
+
+def test_read_fasta_crlf(tmp_path):
+    path = write_bytes(tmp_path, b">p1 desc\r\nMKAL\r\nIVLG\r\n\r\n>p2\r\nKVFE\r\n")
+    assert read_fasta(path) == [("p1 desc", "MKALIVLG"), ("p2", "KVFE")]
+
+
+def test_read_fasta_empty_and_headerless(tmp_path):
+    assert read_fasta(write_bytes(tmp_path, b"")) == []
+    assert read_fasta(write_bytes(tmp_path, b"MKAL\nIVLG\n", "no_header.fasta")) == []
+
+
+def test_read_fasta_memory_maps_large_files(tmp_path):
+    line = b"ACDEFGHIKLMNPQRSTVWY" * 3 + b"\n"
+    n_lines = MMAP_THRESHOLD // len(line) + 1
+    data = b">big\r\n" + line * n_lines + b">tail\nMKAL"
+    path = write_bytes(tmp_path, data)
+    assert path.stat().st_size > MMAP_THRESHOLD
+
+    records = read_fasta(path)
+    assert [header for header, _ in records] == ["big", "tail"]
+    assert records[0][1] == line.strip().decode() * n_lines
+    assert records[1][1] == "MKAL"
+
+
+def test_read_prediction_rows(tmp_path):
+    prediction_file = write_bytes(tmp_path, (
+        b"LEGEND 35 sequence features are calculated\n"
+        b"HEADERS PREDICTIONS LINE,ID,percent-sol,scaled-sol,population-sol,pI\n"
+        b"SEQUENCE DEVIATIONS,>P00547,1,2,3,4\n"
+        b"SEQUENCE PREDICTIONS,>P00547,41.535, 0.336, 0.446, 5.520\n"
+        b"SEQUENCE PREDICTIONS,>sp|P61626|LYSC_HUMAN,64.448, 0.548, 0.446,10.640\r\n"
+        b"SEQUENCE PREDICTIONS,>id,with,commas,50.000, 0.400, 0.446, 7.000\n"
+        b"SEQUENCE PREDICTIONS,>short,1.0\n"
+    ), "seq_prediction.txt")
+
+    assert read_prediction_rows(prediction_file) == [
+        ("P00547", "41.535", "0.336", "0.446", "5.520"),
+        ("sp|P61626|LYSC_HUMAN", "64.448", "0.548", "0.446", "10.640"),
+        ("id,with,commas", "50.000", "0.400", "0.446", "7.000"),
+    ]
+
+
+@pytest.mark.parametrize("with_pyarrow", [True, False])
+def test_parse_results_csv_numpy_dtypes(tmp_path, monkeypatch, with_pyarrow):
+    pd = pytest.importorskip("pandas")
+    if with_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    csv_file = write_bytes(tmp_path, (
+        b"ID,sequence,percent-sol,scaled-sol,population-sol,pI\n"
+        b"101,MKAL,41.535,0.336,0.446,5.520\n"
+        b"102,KVFE,64.448,0.548,0.446,10.640\n"
+    ), "results.csv")
+
+    # Numeric IDs stay text on both paths
+    df = parse_results_csv(csv_file)
+    expected = pd.read_csv(csv_file, dtype={'ID': str, 'sequence': str})
+    pd.testing.assert_frame_equal(df, expected)
+    assert list(df['ID']) == ["101", "102"]
+    assert all(df[col].dtype == "float64" for col in ("percent-sol", "scaled-sol", "population-sol", "pI"))
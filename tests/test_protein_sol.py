@@ -0,0 +1,220 @@
+"""
+Tests for scripts/lib/protein_sol.py that do not need Perl.
+"""
+import csv
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from lib import protein_sol  # noqa: E402
+from lib.io import read_fasta  # noqa: E402
+from lib.protein_sol import RESULTS_CSV_HEADER, RESULTS_CSV_SUFFIX  # noqa: E402
+
+
+def read_results(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_many_tags_headers_and_splits_results(tmp_path, monkeypatch):
+    first = tmp_path / "first.fasta"
+    first.write_text(">lyso human lysozyme\nKVFERC\nELARTL\n")
+    second = tmp_path / "second.fasta"
+    # No trailing newline: the next input must still start on its own line
+    second.write_text(">adk\nMRIILL\n>orig0__lookalike\nGAPGAG")
+    empty = tmp_path / "empty.fasta"
+    empty.write_text("")
+
+    seen = {}
+
+    def fake_prediction(input_fasta, output_prefix, **kwargs):
+        # Stand in for the pipeline: one row per record, ID = first header token
+        records = read_fasta(input_fasta)
+        seen['ids'] = [header for header, _ in records]
+        csv_path = f"{output_prefix}{RESULTS_CSV_SUFFIX}"
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(RESULTS_CSV_HEADER)
+            for n, (header, seq) in enumerate(records):
+                writer.writerow((header.split()[0], seq, f"{n}.0", "0.5", "0.45", "7.00"))
+        return {'csv': csv_path}
+
+    monkeypatch.setattr(protein_sol, "run_protein_sol_prediction", fake_prediction)
+
+    prefixes = [str(tmp_path / name) for name in ("a", "b", "c")]
+    results = protein_sol.run_protein_sol_prediction_many([first, second, empty], prefixes)
+
+    # Every header is tagged with the index of the input it came from
+    assert seen['ids'] == [
+        "orig0__lyso human lysozyme", "orig1__adk", "orig1__orig0__lookalike"
+    ]
+
+    assert [r['csv'] for r in results] == [f"{p}_solubility_results.csv" for p in prefixes]
+    first_rows, second_rows, empty_rows = (read_results(r['csv']) for r in results)
+
+    # Rows go back to their own input with only the batch tag removed
+    assert [(r['ID'], r['sequence']) for r in first_rows] == [("lyso", "KVFERCELARTL")]
+    assert [r['ID'] for r in second_rows] == ["adk", "orig0__lookalike"]
+    assert second_rows[1]['percent-sol'] == "2.0"
+    assert empty_rows == []
+
+
+def test_many_forwards_workers_and_cache(tmp_path, monkeypatch):
+    fasta = tmp_path / "in.fasta"
+    fasta.write_text(">p1\nMKAL\n")
+    calls = []
+
+    def fake_run(name):
+        def run(input_fasta, output_prefix, **kwargs):
+            calls.append((name, kwargs.get('n_workers'), kwargs['use_cache']))
+            csv_path = f"{output_prefix}{RESULTS_CSV_SUFFIX}"
+            with open(csv_path, 'w', newline='') as f:
+                csv.writer(f).writerows([RESULTS_CSV_HEADER, ("orig0__p1", "MKAL", "1", "2", "3", "4")])
+            return {'csv': csv_path}
+        return run
+
+    monkeypatch.setattr(protein_sol, "run_protein_sol_prediction", fake_run("single"))
+    monkeypatch.setattr(protein_sol, "run_protein_sol_prediction_parallel", fake_run("parallel"))
+
+    protein_sol.run_protein_sol_prediction_many([fasta], [str(tmp_path / "a")], use_cache=True)
+    protein_sol.run_protein_sol_prediction_many([fasta], [str(tmp_path / "b")], n_workers=3)
+    assert calls == [("single", None, True), ("parallel", 3, False)]
+
+
+def make_repo(tmp_path, names=("ss_propensities.txt", "seq_reference_data.txt")):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    for name in names:
+        (repo / name).write_text(f"{name} v1\n")
+    return repo, tuple(names)
+
+
+def test_cache_key_tracks_input_and_support_files(tmp_path):
+    repo, pinned = make_repo(tmp_path)
+    fasta = tmp_path / "in.fasta"
+    fasta.write_text(">p1\nMKAL\n")
+
+    key = protein_sol._cache_key(fasta, repo, pinned)
+    assert protein_sol._cache_key(fasta, repo, pinned) == key
+
+    fasta.write_text(">p1\nMKAV\n")
+    changed_input = protein_sol._cache_key(fasta, repo, pinned)
+    assert changed_input != key
+
+    # Editing, or removing, a pinned support file gives a new key
+    (repo / pinned[0]).write_text("ss_propensities.txt v2, longer\n")
+    changed_script = protein_sol._cache_key(fasta, repo, pinned)
+    assert changed_script != changed_input
+
+    (repo / pinned[0]).unlink()
+    assert protein_sol._cache_key(fasta, repo, pinned) not in (key, changed_input, changed_script)
+
+
+def store_outputs(tmp_path, key):
+    prefix = str(tmp_path / "run" / "first")
+    Path(prefix).parent.mkdir()
+    output_files = {
+        'csv': f"{prefix}{RESULTS_CSV_SUFFIX}",
+        'log': f"{prefix}_prediction.log",
+    }
+    for name, path in output_files.items():
+        Path(path).write_text(f"{name} contents\n")
+    protein_sol._store_cached_outputs("prediction", key, prefix, output_files)
+    return output_files
+
+
+def test_cached_outputs_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROTEIN_SOL_CACHE", str(tmp_path / "cache"))
+    store_outputs(tmp_path, "k1")
+
+    prefix = str(tmp_path / "second")
+    loaded = protein_sol._load_cached_outputs("prediction", "k1", prefix)
+    assert loaded == {
+        'csv': f"{prefix}{RESULTS_CSV_SUFFIX}",
+        'log': f"{prefix}_prediction.log",
+    }
+    assert Path(loaded['csv']).read_text() == "csv contents\n"
+    assert Path(loaded['log']).read_text() == "log contents\n"
+
+    assert protein_sol._load_cached_outputs("prediction", "other", prefix) is None
+    assert protein_sol._load_cached_outputs("composition", "k1", prefix) is None
+
+
+def test_damaged_cache_entries_are_misses(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("PROTEIN_SOL_CACHE", str(cache))
+    prefix = str(tmp_path / "out")
+
+    # A writer that died before publishing leaves only its temp directory
+    (cache / "prediction" / f"k1.tmp{12345}").mkdir(parents=True)
+    assert protein_sol._load_cached_outputs("prediction", "k1", prefix) is None
+
+    # An entry without a manifest, or with an unreadable one
+    (cache / "prediction" / "k2").mkdir()
+    assert protein_sol._load_cached_outputs("prediction", "k2", prefix) is None
+    (cache / "prediction" / "k2" / "MANIFEST.json").write_text("{not json")
+    assert protein_sol._load_cached_outputs("prediction", "k2", prefix) is None
+
+    # A manifest naming a file that is gone drops the whole entry
+    store_outputs(tmp_path, "k3")
+    (cache / "prediction" / "k3" / "prediction.log").unlink()
+    assert protein_sol._load_cached_outputs("prediction", "k3", prefix) is None
+    assert not (cache / "prediction" / "k3").exists()
+
+
+def test_store_keeps_the_first_published_entry(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("PROTEIN_SOL_CACHE", str(cache))
+    store_outputs(tmp_path, "k1")
+
+    prefix = str(tmp_path / "again")
+    Path(f"{prefix}{RESULTS_CSV_SUFFIX}").write_text("newer\n")
+    protein_sol._store_cached_outputs("prediction", "k1", prefix, {'csv': f"{prefix}{RESULTS_CSV_SUFFIX}"})
+
+    assert [p.name for p in (cache / "prediction").iterdir()] == ["k1"]
+    loaded = protein_sol._load_cached_outputs("prediction", "k1", str(tmp_path / "third"))
+    assert Path(loaded['csv']).read_text() == "csv contents\n"
+
+
+def test_merge_shard_text_keeps_one_header(tmp_path):
+    header = "LEGEND features\nHEADERS PREDICTIONS LINE,ID,percent-sol\n\n"
+    first = tmp_path / "s0.txt"
+    first.write_text(header + "SEQUENCE PREDICTIONS,>a,1\nSEQUENCE PROFILE,>a,0.1\n\n")
+    second = tmp_path / "s1.txt"
+    second.write_text(header + "SEQUENCE PREDICTIONS,>b,2\n\nSUMS, for this set = 1\n")
+    third = tmp_path / "s2.txt"
+    third.write_text(header + "SEQUENCE PREDICTIONS,>c,3\n\nSUMS, for this set = 2\n")
+    log = tmp_path / "log0.txt"
+    log.write_text("step one\n")
+    log2 = tmp_path / "log1.txt"
+    log2.write_text("step two\n")
+
+    merged = tmp_path / "merged.txt"
+    protein_sol._merge_shard_text([first, second, third], merged)
+    assert merged.read_text() == (
+        header
+        + "SEQUENCE PREDICTIONS,>a,1\nSEQUENCE PROFILE,>a,0.1\n\n"
+        + "SEQUENCE PREDICTIONS,>b,2\n\n"
+        + "SEQUENCE PREDICTIONS,>c,3\n\n"
+        + "SUMS, for this set = 1\n\nSUMS, for this set = 2\n"
+    )
+
+    # Files without per-sequence lines are concatenated whole
+    protein_sol._merge_shard_text([log, log2], merged)
+    assert merged.read_text() == "step one\nstep two\n"
+
+
+@pytest.mark.skipif(shutil.which("perl") is None, reason="needs perl")
+def test_parallel_prediction_matches_single_run(tmp_path):
+    fasta = ROOT / "scripts" / "protein-sol" / "example.fasta"
+    single = protein_sol.run_protein_sol_prediction(fasta, str(tmp_path / "single"))
+    sharded = protein_sol.run_protein_sol_prediction_parallel(fasta, str(tmp_path / "sharded"), n_workers=2)
+
+    assert sharded.keys() == single.keys()
+    for name in ('csv', 'prediction', 'log'):
+        assert Path(sharded[name]).read_bytes() == Path(single[name]).read_bytes(), name
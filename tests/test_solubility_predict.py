@@ -0,0 +1,139 @@
+"""
+Tests for src/tools/solubility_predict.py that do not need Perl.
+"""
+import asyncio
+import csv
+import io
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from tools import solubility_predict  # noqa: E402
+from tools.solubility_predict import _csv_rows, _SequenceCache  # noqa: E402
+
+
+def test_csv_rows_matches_dictreader():
+    text = "ID,sequence,note\r\np1,MKAL,a\r\n\r\np2,KVFE\r\np3\r\n\r\np4,\"GA,PG\",x\r\n"
+    reader = csv.reader(io.StringIO(text, newline=''))
+    next(reader)
+    rows = list(_csv_rows(reader, 3))
+
+    assert rows == [
+        ["p1", "MKAL", "a"],
+        ["p2", "KVFE", ""],
+        ["p3", "", ""],
+        ["p4", "GA,PG", "x"],
+    ]
+
+    # Same rows, in the same order, as DictReader gives (restval '' for short rows)
+    expected = [
+        [row[name] for name in ("ID", "sequence", "note")]
+        for row in csv.DictReader(io.StringIO(text, newline=''), restval='')
+    ]
+    assert rows == expected
+
+
+def prediction(seq_id, seq, percent):
+    return {"ID": seq_id, "sequence": seq, "percent_sol": percent,
+            "scaled_sol": "0.5", "population_sol": "0.446", "pI": "7.0"}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROTEIN_SOL_CACHE", str(tmp_path))
+    return _SequenceCache()
+
+
+def test_sequence_cache_hits_return_the_callers_sequence(cache):
+    cache.put([prediction("p1", "MKAL", "41.5")])
+
+    # Whitespace and case do not matter for the lookup, but the returned row
+    # keeps the text the caller passed in
+    hit = cache.get("renamed", "mk al\n")
+    assert hit == prediction("renamed", "mk al\n", "41.5")
+    assert cache.get("p1", "MKAL") == prediction("p1", "MKAL", "41.5")
+    assert cache.misses == 0
+
+    assert cache.get("p2", "MKAV") is None
+    assert cache.misses == 1
+
+
+def test_sequence_cache_split(cache):
+    cache.put([prediction("p1", "MKAL", "41.5")])
+    cached = {}
+    missing = list(cache.split([("a", "MKAL"), ("b", "KVFE")], cached))
+
+    assert missing == [("b", "KVFE")]
+    assert cached == {"a": prediction("a", "MKAL", "41.5")}
+    assert cache.misses == 1
+
+
+def test_sequence_cache_is_versioned(cache, monkeypatch):
+    cache.put([prediction("p1", "MKAL", "41.5")])
+    monkeypatch.setattr(cache, "version", "other-pipeline")
+    assert cache.get("p1", "MKAL") is None
+
+
+def test_sequence_cache_evicts_least_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(solubility_predict, "CACHE_MAX_ENTRIES", 2)
+    cache.put([prediction("a", "AAAA", "1"), prediction("b", "CCCC", "2")])
+
+    # Age both entries, then touch "a" with a lookup
+    for seq, age in (("AAAA", 200), ("CCCC", 100)):
+        path = cache.root / f"{cache.key(seq)}.json"
+        os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+    assert cache.get("a", "AAAA") is not None
+
+    cache.put([prediction("d", "DDDD", "3")])
+
+    assert cache.get("b", "CCCC") is None
+    assert cache.get("a", "AAAA") is not None
+    assert cache.get("d", "DDDD") is not None
+    assert len(list(cache.root.glob("*.json"))) == 2
+
+
+def test_cached_sequence_honours_return_predictions(cache):
+    cache.put([prediction("p1", "MKAL", "41.5")])
+    predict = getattr(solubility_predict.protein_sol_solubility_predict, "fn",
+                      solubility_predict.protein_sol_solubility_predict)
+
+    full = asyncio.run(predict(sequence="MKAL", sequence_id="p1", use_cache=True))
+    assert full["predictions"] == [prediction("p1", "MKAL", "41.5")]
+
+    counted = asyncio.run(predict(sequence="MKAL", sequence_id="p1", use_cache=True,
+                                  return_predictions=False))
+    assert counted["predictions_count"] == 1
+    assert "predictions" not in counted
+
+
+@pytest.mark.parametrize("error", [OSError("no semaphores"), RuntimeError("no __main__ guard")])
+def test_pool_startup_failure_falls_back_to_subprocess(tmp_path, monkeypatch, error):
+    def broken_executor(script_path):
+        raise error
+
+    monkeypatch.setattr(solubility_predict, "_get_executor", broken_executor)
+
+    # Stand-in for protein_sol_predict.py: writes the CSV the fallback parses
+    script = tmp_path / "fake_predict.py"
+    script.write_text(
+        "import sys\n"
+        "from pathlib import Path\n"
+        "out = Path(sys.argv[sys.argv.index('--output-dir') + 1])\n"
+        "(out / 'in.fasta-protein_sol.csv').write_text(\n"
+        "    'ID,sequence,percent-sol,scaled-sol,population-sol,pI\\np1,MKAL,41.5,0.5,0.446,7.0\\n')\n"
+    )
+    prediction_csv = tmp_path / "in.fasta-protein_sol.csv"
+
+    predictions, _, failure = asyncio.run(solubility_predict._run_pipeline(
+        script, str(tmp_path / "in.fasta"), prediction_csv, quiet=True))
+
+    assert failure is None
+    assert predictions == [prediction("p1", "MKAL", "41.5")]
+    assert solubility_predict._EXECUTOR is None
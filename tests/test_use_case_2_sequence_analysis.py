@@ -0,0 +1,37 @@
+"""
+Tests for examples/use_case_2_sequence_analysis.py.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "examples"))
+
+from use_case_2_sequence_analysis import parse_composition_results  # noqa: E402
+
+
+def test_parse_composition_results(tmp_path):
+    comp_file = tmp_path / "composition.txt"
+    comp_file.write_text(
+        "preamble 1\n"
+        ">p1 human lysozyme\n"
+        "A 10.14\n"
+        "C 5.41 trailing columns\n"
+        "naa 148\n"
+        "label text\n"
+        "single\n"
+        "\n"
+        ">p2\n"
+        ">p3\n"
+        "K-R -5.41\n"
+    )
+
+    assert parse_composition_results(comp_file) == {
+        "p1 human lysozyme": {"A": 10.14, "C": 5.41, "naa": 148.0},
+        "p2": {},
+        "p3": {"K-R": -5.41},
+    }
+
+
+def test_parse_composition_results_missing_file(tmp_path):
+    assert parse_composition_results(tmp_path / "missing.txt") == {}